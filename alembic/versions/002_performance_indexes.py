@@ -115,6 +115,8 @@ def upgrade() -> None:
     )
     
     # Text search optimization
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm;")
+
     op.execute("""
         CREATE INDEX idx_cards_name_trgm ON pokemon_cards 
         USING gin (name gin_trgm_ops);
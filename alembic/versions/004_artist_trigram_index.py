@@ -0,0 +1,41 @@
+"""Add trigram index for artist search
+
+Revision ID: 004_artist_trigram_index
+Revises: 003_audit_enhancements
+Create Date: 2026-10-17T12:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = '004_artist_trigram_index'
+down_revision: Union[str, Sequence[str], None] = '003_audit_enhancements'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Apply database schema changes.
+    
+    Changes in this migration:
+    - Add trigram index so artist ILIKE '%...%' searches can use an index
+    """
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm;")
+
+    op.execute("""
+        CREATE INDEX IF NOT EXISTS idx_cards_artist_trgm ON pokemon_cards 
+        USING gin (artist gin_trgm_ops);
+    """)
+
+    op.execute("ANALYZE pokemon_cards;")
+
+
+def downgrade() -> None:
+    """Revert database schema changes.
+    
+    This migration reverses:
+    - Removes the artist trigram index
+    """
+    op.execute("DROP INDEX IF EXISTS idx_cards_artist_trgm;")
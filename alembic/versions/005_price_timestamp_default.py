@@ -0,0 +1,47 @@
+"""Stamp price snapshots on the database side
+
+Revision ID: 005_price_timestamp_default
+Revises: 004_artist_trigram_index
+Create Date: 2026-10-17T12:30:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '005_price_timestamp_default'
+down_revision: Union[str, Sequence[str], None] = '004_artist_trigram_index'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Apply database schema changes.
+    
+    Changes in this migration:
+    - Default price_snapshots.timestamp to the current UTC time
+    """
+    op.alter_column(
+        'price_snapshots',
+        'timestamp',
+        server_default=sa.text("timezone('utc', now())"),
+        existing_type=sa.DateTime(),
+        existing_nullable=False
+    )
+
+
+def downgrade() -> None:
+    """Revert database schema changes.
+    
+    This migration reverses:
+    - Removes the price_snapshots.timestamp default
+    """
+    op.alter_column(
+        'price_snapshots',
+        'timestamp',
+        server_default=None,
+        existing_type=sa.DateTime(),
+        existing_nullable=False
+    )
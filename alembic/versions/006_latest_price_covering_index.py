@@ -0,0 +1,48 @@
+"""Add covering index for latest price lookups
+
+Revision ID: 006_latest_price_covering_index
+Revises: 005_price_timestamp_default
+Create Date: 2026-10-17T13:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = '006_latest_price_covering_index'
+down_revision: Union[str, Sequence[str], None] = '005_price_timestamp_default'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Apply database schema changes.
+    
+    Changes in this migration:
+    - Add (card_id, timestamp DESC) index carrying prices, condition and currency,
+      so the latest price for a card is an index-only scan
+    - Drop idx_price_card_time: the new index has the same leading key and
+      serves the same per-card time ordering
+    """
+    op.execute("""
+        CREATE INDEX IF NOT EXISTS idx_price_card_latest ON price_snapshots 
+        (card_id, timestamp DESC) INCLUDE (prices, condition, currency);
+    """)
+    op.execute("DROP INDEX IF EXISTS idx_price_card_time;")
+
+    op.execute("ANALYZE price_snapshots;")
+
+
+def downgrade() -> None:
+    """Revert database schema changes.
+    
+    This migration reverses:
+    - Restores idx_price_card_time
+    - Removes the latest price covering index
+    """
+    op.execute("""
+        CREATE INDEX IF NOT EXISTS idx_price_card_time ON price_snapshots 
+        (card_id, timestamp);
+    """)
+    op.execute("DROP INDEX IF EXISTS idx_price_card_latest;")
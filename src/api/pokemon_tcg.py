@@ -1,15 +1,35 @@
 """Enhanced Pokemon TCG API Client with better matching logic, database persistence, and adaptive rate limiting"""
 
 import asyncio
+import re
 from typing import Any, Dict, List, Optional, Tuple
 
 import aiohttp
 
 from ..database.service import DatabaseService
 from ..price_mappings import PriceMappingConfig
+from ..utils.http_session import get_optimized_session
 from ..utils.logger import logger
 from ..utils.rate_limiter import rate_limiter
 
+# Card name / number normalization runs for every lookup, so compile once
+_NAME_CLEAN_RE = re.compile(r"[^\w\s-]")
+_PROMO_NUMBER_RE = re.compile(r"(SWSH|SM|XY|BW|DP|HGSS)\s*-?\s*P?\s*(\d+)", re.IGNORECASE)
+_STANDALONE_PROMO_RE = re.compile(r"^(SWSH|SM|XY|BW)\d+$", re.IGNORECASE)
+_DIGITS_RE = re.compile(r"(\d+)")
+
+# Common set name variations to normalize
+_SET_NAME_MAPPINGS = {
+    "sword shield promos": "SWSH Black Star Promos",
+    "swsh promos": "SWSH Black Star Promos",
+    "sword & shield promos": "SWSH Black Star Promos",
+    "sun moon promos": "SM Black Star Promos",
+    "sm promos": "SM Black Star Promos",
+    "xy promos": "XY Black Star Promos",
+    "black white promos": "BW Black Star Promos",
+    "bw promos": "BW Black Star Promos",
+}
+
 
 class PokemonTCGClient:
     def __init__(self, api_key: str, rate_limit: float = 0.05, persist_to_db: bool = True):
@@ -207,37 +227,13 @@ class PokemonTCGClient:
 
     def _clean_card_name(self, card_name: str) -> str:
         """Clean card name for better matching"""
-        # Remove common suffixes that might interfere
-        suffixes_to_remove = [" v", " vmax", " vstar", " ex", " gx", " tag team"]
-        clean_name = card_name.lower()
-        for suffix in suffixes_to_remove:
-            if clean_name.endswith(suffix):
-                clean_name = clean_name[: -len(suffix)]
-                break
-
         # Remove special characters but keep spaces
-        import re
-
-        clean_name = re.sub(r"[^\w\s-]", "", card_name).strip()
-
-        return clean_name
+        return _NAME_CLEAN_RE.sub("", card_name).strip()
 
     def _clean_set_name(self, set_name: str) -> str:
         """Clean set name for better matching"""
-        # Common set name variations to normalize
-        set_mappings = {
-            "sword shield promos": "SWSH Black Star Promos",
-            "swsh promos": "SWSH Black Star Promos",
-            "sword & shield promos": "SWSH Black Star Promos",
-            "sun moon promos": "SM Black Star Promos",
-            "sm promos": "SM Black Star Promos",
-            "xy promos": "XY Black Star Promos",
-            "black white promos": "BW Black Star Promos",
-            "bw promos": "BW Black Star Promos",
-        }
-
         lower_set = set_name.lower()
-        for key, value in set_mappings.items():
+        for key, value in _SET_NAME_MAPPINGS.items():
             if key in lower_set:
                 return value
 
@@ -248,23 +244,18 @@ class PokemonTCGClient:
         if not card_number:
             return ""
 
-        # Remove common prefixes/suffixes
-        import re
-
         # Handle different formats: "11/20", "SWSH283", "SM-P 283", etc.
         # First, check if it's a promo number
-        promo_match = re.search(
-            r"(SWSH|SM|XY|BW|DP|HGSS)\s*-?\s*P?\s*(\d+)", card_number, re.IGNORECASE
-        )
+        promo_match = _PROMO_NUMBER_RE.search(card_number)
         if promo_match:
             return f"{promo_match.group(1)}{promo_match.group(2)}".upper()
 
         # Check for standalone promo numbers
-        if re.match(r"^(SWSH|SM|XY|BW)\d+$", card_number, re.IGNORECASE):
+        if _STANDALONE_PROMO_RE.match(card_number):
             return card_number.upper()
 
         # For regular set numbers, extract just the number part
-        number_match = re.search(r"(\d+)", card_number)
+        number_match = _DIGITS_RE.search(card_number)
         if number_match:
             return number_match.group(1)
 
@@ -622,9 +613,9 @@ class PokemonTCGClient:
         # This would check if we have recent pricing data in the database
         # to avoid unnecessary API calls
 
-        # Fetch from API
+        # Fetch from API, reusing the pooled keep-alive session when none is given
         if not session:
-            async with aiohttp.ClientSession() as session:
+            async with get_optimized_session("pokemon_tcg") as session:
                 card_data = await self.get_card_data(name, set_name, session, card_number=number)
         else:
             card_data = await self.get_card_data(name, set_name, session, card_number=number)
@@ -640,6 +631,26 @@ class PokemonTCGClient:
             }
         return None
 
+    async def get_card_pricing_bulk(
+        self, queries: List[Tuple[str, str, str]], session: aiohttp.ClientSession = None
+    ) -> List[Optional[Dict[str, Any]]]:
+        """Price many (name, set_name, number) queries concurrently over one session.
+
+        Results are returned in query order; a failed lookup yields None.
+        """
+        if not session:
+            async with get_optimized_session("pokemon_tcg") as session:
+                return await self.get_card_pricing_bulk(queries, session)
+
+        results = await asyncio.gather(
+            *(
+                self.get_card_pricing(name, set_name, number, session=session)
+                for name, set_name, number in queries
+            ),
+            return_exceptions=True,
+        )
+        return [None if isinstance(result, Exception) else result for result in results]
+
     async def get_all_sets(self, session: aiohttp.ClientSession) -> List[Dict[str, Any]]:
         """Get all sets from the Pokemon TCG API."""
         headers = {"X-Api-Key": self.api_key} if self.api_key else {}
@@ -1,728 +1,476 @@
 """Scryfall API Client for Magic: The Gathering cards"""
 
 import asyncio
-from typing import Any, Dict, List, Optional
+import json
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
 
 import aiohttp
+import diskcache
+
+try:
+    import orjson
+except ImportError:  # Optional speedup; fall back to the stdlib parser
+    orjson = None
+
+try:
+    import brotli  # noqa: F401  # Lets aiohttp/httpx decode "br" responses
+    _ACCEPT_ENCODING = "br, gzip, deflate"
+except ImportError:
+    _ACCEPT_ENCODING = "gzip, deflate"
+
+try:
+    import httpx
+except ImportError:  # Optional HTTP/2 transport; aiohttp is used otherwise
+    httpx = None
 
 from ..utils.logger import logger
+from ..utils.rate_limiter import rate_limiter
+from .scryfall_extract import extract_features, extract_finish, extract_metadata
+
+_json_loads = orjson.loads if orjson is not None else json.loads
+
+_REQUEST_ERRORS = (aiohttp.ClientError, asyncio.TimeoutError, ValueError) + (
+    (httpx.HTTPError,) if httpx is not None else ()
+)
 
 
 class ScryfallClient:
-    def __init__(self, rate_limit: float = 0.1):
+    def __init__(
+        self,
+        rate_limit: float = 0.1,
+        max_concurrent: int = 5,
+        cache_dir: Optional[Path] = None,
+        cache_size: int = 10000,
+        cache_ttl: float = 24 * 60 * 60,
+        http2: bool = False,
+    ):
         self.base_url = "https://api.scryfall.com/cards/search"
-        self.rate_limit = rate_limit
+        self.named_url = "https://api.scryfall.com/cards/named"
+        self.sets_url = "https://api.scryfall.com/sets"
+        self.rate_limit = rate_limit  # Seconds between requests
+        self.endpoint_name = "scryfall"
+        if rate_limit > 0:
+            # Drive the shared Scryfall bucket from the configured spacing, with
+            # the same 1.5x burst as its built-in default
+            requests_per_second = 1 / rate_limit
+            rate_limiter.configure_endpoint(
+                self.endpoint_name, requests_per_second, burst_capacity=requests_per_second * 1.5
+            )
+        self.TIMEOUT = 10  # Request timeout in seconds
+        self.MAX_RETRIES = 3  # Retries after a 429 response
+        self.MISSING_TTL = 6 * 60 * 60  # How long a definite 404 is trusted
+
+        # Results keyed by (card_name, set_name, is_foil). Prices drift, so
+        # entries expire after cache_ttl seconds in memory and on disk.
+        self.cache_size = cache_size
+        self.cache_ttl = cache_ttl
+        self._memory_cache: "OrderedDict[Tuple[str, str, bool], Tuple[float, Dict[str, Any]]]" = (
+            OrderedDict()
+        )
+        # (card_name, set_name) pairs Scryfall answered 404 for, with expiry.
+        # Skips both the cache lookup and the HTTP round trips on repeat misses.
+        self._missing: "OrderedDict[Tuple[str, str], float]" = OrderedDict()
+        self._disk_cache = (
+            diskcache.Cache(Path(cache_dir) / "scryfall", eviction_policy="least-recently-used")
+            if cache_dir is not None
+            else None
+        )
+
+        # Bounds in-flight requests; pacing comes from the shared token bucket
+        self._semaphore = asyncio.Semaphore(max_concurrent)
+
+        # Lazily created keep-alive session shared by all lookups on this client.
+        # With http2=True (and httpx[http2] installed) it is an httpx client that
+        # multiplexes concurrent lookups over one connection.
+        self.http2 = http2
+        self._session: Optional[Any] = None
+        self._session_lock = asyncio.Lock()
+
+        # Lowercased set codes and names -> set code, fetched once from /sets
+        self._set_codes: Optional[Dict[str, str]] = None
+        self._set_codes_lock = asyncio.Lock()
+
+    @staticmethod
+    def _is_closed(session: Any) -> bool:
+        """Closed-state check for either an aiohttp or an httpx session"""
+        if httpx is not None and isinstance(session, httpx.AsyncClient):
+            return session.is_closed
+        return session.closed
+
+    async def _get_session(self) -> Any:
+        """Get the client's pooled session, creating it on first use"""
+        if self._session is None or self._is_closed(self._session):
+            async with self._session_lock:
+                if self._session is None or self._is_closed(self._session):
+                    self._session = self._create_session()
+        return self._session
+
+    def _create_session(self) -> Any:
+        """Create the pooled session: HTTP/2 via httpx when requested, else aiohttp"""
+        if self.http2:
+            if httpx is None:
+                logger.warning("httpx is not installed, using aiohttp for Scryfall")
+            else:
+                try:
+                    session = httpx.AsyncClient(
+                        http2=True,
+                        limits=httpx.Limits(max_connections=4, max_keepalive_connections=4),
+                        timeout=self.TIMEOUT,
+                    )
+                    logger.debug("Created pooled Scryfall HTTP/2 session")
+                    return session
+                except ImportError:  # httpx without the h2 extra
+                    logger.warning("HTTP/2 support (h2) is not installed, using aiohttp")
+
+        connector = aiohttp.TCPConnector(
+            limit=20,
+            limit_per_host=10,
+            ttl_dns_cache=600,
+            keepalive_timeout=75,
+        )
+        session = aiohttp.ClientSession(
+            connector=connector,
+            timeout=aiohttp.ClientTimeout(total=self.TIMEOUT),
+        )
+        logger.debug("Created pooled Scryfall HTTP session")
+        return session
+
+    async def aclose(self):
+        """Close the pooled session and the disk cache if they were created"""
+        if self._session is not None and not self._is_closed(self._session):
+            if httpx is not None and isinstance(self._session, httpx.AsyncClient):
+                await self._session.aclose()
+            else:
+                await self._session.close()
+        self._session = None
+        if self._disk_cache is not None:
+            self._disk_cache.close()
 
     async def get_card_data(
         self,
         card_name: str,
         set_name: str,
-        session: aiohttp.ClientSession,
+        session: Optional[Any] = None,
         unique_characteristics: List[str] = None,
     ) -> Optional[Dict[str, Any]]:
-        """Get card data from Scryfall API"""
-        # Build search query
-        search_query = f'name:"{card_name}"'
-        if set_name and set_name.lower() != "unknown":
-            search_query += f' set:"{set_name}"'
-
-        params = {"q": search_query, "format": "json", "page": 1}
-
-        # Rate limiting
-        await asyncio.sleep(self.rate_limit)
-
-        try:
-            async with session.get(self.base_url, params=params) as response:
-                if response.status == 200:
-                    data = await response.json()
-                    cards = data.get("data", [])
-
-                    if cards:
-                        card = cards[0]  # Take first match
-
-                        # For MTG, handle foil vs non-foil based on characteristics
-                        is_foil = False
-                        if unique_characteristics:
-                            is_foil = any("foil" in char.lower() for char in unique_characteristics)
-
-                        prices = card.get("prices", {})
-
-                        # Select appropriate NEAR MINT price
-                        # Scryfall prices are for Near Mint condition by default
-                        if is_foil and "usd_foil" in prices:
-                            usd_price = float(prices.get("usd_foil", 0) or 0)
-                            logger.info(f"      Using Near Mint foil price: ${usd_price}")
-                        else:
-                            usd_price = float(prices.get("usd", 0) or 0)
-                            logger.info(f"      Using Near Mint regular price: ${usd_price}")
-
-                        if usd_price > 0:
-                            return self._format_card_data(card, usd_price, is_foil)
-
-                return None
-
-        except Exception as e:
-            logger.error(f"Scryfall API error: {e}")
+        """Get card data from Scryfall API
+
+        Uses the caller's session (aiohttp or httpx) when given, otherwise the
+        client's pooled one.
+        """
+        # For MTG, handle foil vs non-foil based on characteristics
+        # (joined with spaces so a match can never span two characteristics)
+        is_foil = "foil" in " ".join(unique_characteristics or ()).lower()
+
+        set_name_lower = (set_name or "").lower()
+        cache_key = (card_name.lower(), set_name_lower, is_foil)
+        missing_key = cache_key[:2]
+        if self._is_known_missing(missing_key):
             return None
 
-    def _extract_finish(self, card: Dict[str, Any], is_foil: bool) -> str:
-        """Extract finish information from MTG card data - FIXED VERSION"""
-
-        # 1. Check card finishes array
-        finishes = card.get("finishes", [])
-
-        # 2. Check frame effects for special treatments
-        frame_effects = card.get("frame_effects", [])
-
-        # 3. Check if it's a special promo or treatment
-        promo_types = card.get("promo_types", []) if card.get("promo") else []
-
-        # 4. Check card layout for special types
-        layout = card.get("layout", "")
-
-        # 5. Check border color for special editions
-        border_color = card.get("border_color", "")
-
-        # 6. Check set information for special treatments
-        set_name = card.get("set_name", "").lower()
-        set_type = card.get("set_type", "")
-
-        # 7. Build finish string based on all factors
-        finish_parts = []
-
-        # Special frame treatments (highest priority)
-        frame_treatments = {
-            # Standard treatments
-            "showcase": "Showcase",
-            "extendedart": "Extended Art",
-            "borderless": "Borderless",
-            "fullart": "Full Art",
-            "textless": "Textless",
-            "inverted": "Inverted",
-            "etched": "Etched",
-            # Special frame types
-            "fuse": "Fuse",
-            "companion": "Companion",
-            "nyxtouched": "Nyxtouched",
-            "miracle": "Miracle",
-            "lesson": "Lesson",
-            "snow": "Snow",
-            "legendary": "Legendary",
-            "devoid": "Devoid",
-            "tombstone": "Tombstone",
-            "colorshifted": "Colorshifted",
-            # Double-faced cards
-            "sunmoondfc": "Double-Faced",
-            "mooneldrazidfc": "Double-Faced",
-            "originpwdfc": "Double-Faced",
-            "waxingandwaningmoondfc": "Double-Faced",
-            "convertdfc": "Double-Faced",
-            # Newer treatments
-            "shatteredglass": "Shattered Glass",
-            "spaceic": "Spaceic",
-            "upsidedowndfc": "Upside Down",
-        }
+        cached = self._get_cached(cache_key)
+        if cached is not None:
+            return cached
 
-        # Check for special frame treatments
-        for effect in frame_effects:
-            if effect in frame_treatments:
-                finish_parts.append(frame_treatments[effect])
-                break  # Usually only one major treatment
-
-        # Check for special set-based foil treatments
-        special_foil_treatments = {
-            # Set-specific foils
-            "unfinity": "Galaxy Foil",
-            "wilds of eldraine": "Confetti Foil",
-            "march of the machine": "Halo Foil",
-            "phyrexia: all will be one": "Oil Slick",
-            "the brothers' war": "Double Rainbow",
-            # Product-specific foils
-            "warhammer 40,000": "Surge Foil",
-            "doctor who": "Surge Foil",
-            "lord of the rings": "Surge Foil",
-            "fallout": "Surge Foil",
-            "assassin's creed": "Surge Foil",
-            "final fantasy": "Surge Foil",
-            # Special series
-            "secret lair": "Secret Lair",
-            "from the vault": "From the Vault",
-            "masterpiece": "Masterpiece",
-            "mystical archive": "Mystical Archive",
-            "secret lair drop": "Secret Lair",
-        }
+        if session is None:
+            session = await self._get_session()
 
-        # Check if this card has special foil treatment based on set
-        foil_treatment = ""
-        for set_pattern, treatment in special_foil_treatments.items():
-            if set_pattern in set_name:
-                foil_treatment = treatment
-                break
-
-        # Special finishes from the finishes array
-        if "etched" in finishes:
-            if "Etched" not in finish_parts:
-                finish_parts.append("Etched")
-
-        # Foil handling - now with special treatments
-        if is_foil or "foil" in finishes:
-            # Check for special foil types first
-            if foil_treatment:
-                # Some treatments are standalone
-                if foil_treatment in [
-                    "Galaxy Foil",
-                    "Oil Slick",
-                    "Surge Foil",
-                    "Halo Foil",
-                    "Confetti Foil",
-                    "Double Rainbow",
-                ]:
-                    finish_parts.append(foil_treatment)
-                elif foil_treatment == "From the Vault":
-                    finish_parts.append("From the Vault Foil")
-                else:
-                    # Add treatment if not already present
-                    if foil_treatment not in finish_parts:
-                        finish_parts.append(foil_treatment)
-                    finish_parts.append("Foil")
-
-            # Check for textured foil
-            elif "textured" in finishes or any("textured" in effect for effect in frame_effects):
-                finish_parts.append("Textured Foil")
-
-            # Check for etched foil combination
-            elif "etched" in finishes and "foil" in finishes:
-                # Both etched and foil
-                if "Etched" in finish_parts:
-                    finish_parts.append("Foil")
-                else:
-                    finish_parts.append("Etched Foil")
-
-            # Regular foil - but check for special foil types from promos
-            elif promo_types:
-                # Promo foils often have special designations
-                promo_foil_types = {
-                    "prerelease": "Prerelease Foil",
-                    "datestamped": "Date Stamped Foil",
-                    "stamped": "Stamped Foil",
-                    "setpromo": "Set Promo Foil",
-                    "buyabox": "Buy-a-Box Foil",
-                    "bundle": "Bundle Foil",
-                    "fnm": "FNM Foil",
-                    "judgegift": "Judge Foil",
-                    "arenaleague": "Arena League Foil",
-                    "gameday": "Game Day Foil",
-                    "release": "Release Foil",
-                    "convention": "Convention Foil",
-                    "tourney": "Tournament Foil",
-                    "instore": "Store Championship Foil",
-                    "openhouse": "Open House Foil",
-                    "planeswalkerstamped": "Planeswalker Stamped Foil",
-                    "wpnstamped": "WPN Foil",
-                    "playpromo": "Play Promo Foil",
-                }
-
-                foil_added = False
-                for promo in promo_types:
-                    if promo in promo_foil_types:
-                        finish_parts.append(promo_foil_types[promo])
-                        foil_added = True
-                        break
-
-                if not foil_added and not foil_treatment:
-                    finish_parts.append("Foil")
-            else:
-                # Standard foil (if no special treatment found)
-                if not foil_treatment:
-                    finish_parts.append("Foil")
-
-        # Special set types that affect finish
-        special_set_finishes = {
-            "masterpiece": "Masterpiece",
-            "from_the_vault": "From the Vault",
-            "spellbook": "Spellbook",
-            "signature_spellbook": "Signature Spellbook",
-            "secret_lair": "Secret Lair",
-            "box": "Box Topper",
-            "memorabilia": "Memorabilia",
-            "masters": "Masters",
-            "duel_deck": "Duel Deck",
-            "commander": "Commander",
-            "planechase": "Planechase",
-            "archenemy": "Archenemy",
-            "vanguard": "Vanguard",
-            "funny": "Un-set",
-            "treasure_chest": "Treasure Chest",
-            "promo": "Promo",
-        }
+        has_set = set_name_lower and set_name_lower != "unknown"
+        # The named endpoint's set filter only accepts a set code, so a code or
+        # set name is resolved against Scryfall's set list; anything unknown is
+        # checked against the returned card instead
+        set_code = (await self._get_set_codes(session)).get(set_name_lower) if has_set else None
 
-        if set_type in special_set_finishes and special_set_finishes[set_type] not in finish_parts:
-            finish_parts.append(special_set_finishes[set_type])
-
-        # Special printings and variants
-        if card.get("variation", False):
-            finish_parts.append("Variant")
-
-        if card.get("oversized", False):
-            finish_parts.append("Oversized")
-
-        # Serialized cards (check collector number)
-        collector_number = card.get("collector_number", "")
-        if "/" in collector_number and any(
-            serial in collector_number for serial in ["999", "500", "250", "100"]
-        ):
-            finish_parts.append("Serialized")
-
-        # Special treatments from card name
-        card_name_lower = card.get("name", "").lower()
-        if "retro" in card_name_lower or "old border" in card_name_lower:
-            finish_parts.append("Retro Frame")
-
-        # Rarity-based special finishes
-        rarity = card.get("rarity", "")
-        if rarity == "mythic" and not any("Mythic" in part for part in finish_parts):
-            # Some mythics have special finishes
-            if "showcase" in frame_effects or "extendedart" in frame_effects:
-                pass  # Already handled
-            elif set_type in ["masters", "core", "expansion"] and is_foil:
-                finish_parts.append("Mythic")
-
-        # Special card treatments
-        special_treatments = {
-            # Bonus sheets
-            "mystical archive": "Mystical Archive",
-            "multiverse legends": "Multiverse Legends",
-            "retro artifacts": "Retro Artifacts",
-            "enchanting tales": "Enchanting Tales",
-            "tales of middle-earth": "Tales of Middle-earth",
-            # Special frames
-            "neon": "Neon Ink",
-            "schematic": "Schematic",
-            "blueprint": "Blueprint",
-            "stained glass": "Stained Glass",
-            "comic book": "Comic Book",
-            "anime": "Anime",
-            # Step treatments
-            "step-and-compleat": "Step-and-Compleat",
-            "phyrexian": "Phyrexian",
-        }
-
-        for pattern, treatment in special_treatments.items():
-            if pattern in set_name or pattern in card_name_lower:
-                if treatment not in finish_parts:
-                    finish_parts.append(treatment)
-
-        # Border colors (special editions)
-        if border_color == "gold":
-            finish_parts.append("Gold Border")
-        elif border_color == "silver":
-            finish_parts.append("Silver Border")
-
-        # Special card types from type_line
-        type_line = card.get("type_line", "").lower()
-        if (
-            "planeswalker" in type_line
-            and is_foil
-            and not any("Planeswalker" in part for part in finish_parts)
-        ):
-            # Special planeswalker printings
-            if "borderless" in frame_effects:
-                pass  # Already handled as "Borderless"
-            elif any(promo in promo_types for promo in ["stamped", "prerelease"]):
-                pass  # Already handled
-
-        # Combine finish parts intelligently
-        if len(finish_parts) == 0:
-            # CHANGED: Always return a finish - default to Non-Foil for regular cards
-            return "Non-Foil"
-        elif len(finish_parts) == 1:
-            return finish_parts[0]
-        else:
-            # Special combinations and priority ordering
+        # Exact single-card lookup returns the card object directly, with no
+        # search-list wrapper around it
+        named_params = {"exact": card_name, "format": "json"}
+        if set_code:
+            named_params["set"] = set_code
 
-            # Serialized takes highest priority
-            if "Serialized" in finish_parts:
-                # Serialized + Double Rainbow (Brothers' War)
-                if "Double Rainbow" in finish_parts:
-                    return "Serialized Double Rainbow"
+        # Build search query (used when the named lookup finds nothing, or only
+        # a printing from another set)
+        search_query = f'name:"{card_name}"'
+        if has_set:
+            search_query += f' set:"{set_code or set_name}"'
+
+        search_params = {"q": search_query, "format": "json", "page": 1}
+
+        async with self._semaphore:
+            # Use adaptive rate limiting
+            await rate_limiter.acquire(self.endpoint_name)
+            status, card = await self._request_card(session, self.named_url, named_params)
+
+            # Without a set filter the named lookup may return another printing
+            if (
+                card
+                and has_set
+                and not set_code
+                and card.get("set_name", "").lower() != set_name_lower
+            ):
+                status, card = 404, None
+
+            if status == 404:
+                await rate_limiter.acquire(self.endpoint_name)
+                status, card = await self._request_card(session, self.base_url, search_params)
+
+            if status == 404:
+                self._mark_missing(missing_key)
+
+        result = self._price_card(card, is_foil) if card else None
+        if result is not None:
+            self._store_cached(cache_key, result)
+        return result
+
+    async def _get_set_codes(self, session: Any) -> Dict[str, str]:
+        """Map lowercased set codes and names to set codes, loading /sets once
+
+        The list is kept for cache_ttl on disk. If it can't be fetched the map
+        is empty, so lookups fall back to checking the returned card's set.
+        """
+        if self._set_codes is not None:
+            return self._set_codes
+
+        async with self._set_codes_lock:
+            if self._set_codes is not None:
+                return self._set_codes
+
+            codes = self._disk_cache.get(("sets",)) if self._disk_cache is not None else None
+            if codes is None:
+                codes = {}
+                await rate_limiter.acquire(self.endpoint_name)
+                try:
+                    status, _, body = await self._get(
+                        session, self.sets_url, {}, {"Accept-Encoding": _ACCEPT_ENCODING}
+                    )
+                    if status == 200:
+                        rate_limiter.report_success(self.endpoint_name)
+                        sets = _json_loads(body).get("data", [])
+                        # Names first so a code always wins over a same-named set
+                        for field in ("name", "code"):
+                            codes.update((s[field].lower(), s["code"]) for s in sets)
+                        if self._disk_cache is not None:
+                            self._disk_cache.set(("sets",), codes, expire=self.cache_ttl)
+                    else:
+                        logger.warning(f"Scryfall set list unavailable (HTTP {status})")
+                except _REQUEST_ERRORS as e:
+                    rate_limiter.report_error(self.endpoint_name)
+                    logger.error(f"Scryfall set list error: {e}")
+
+            self._set_codes = codes
+            return codes
+
+    def _is_known_missing(self, key: Tuple[str, str]) -> bool:
+        """True when Scryfall recently reported no card for this name and set"""
+        now = time.time()
+        expires_at = self._missing.get(key)
+        if expires_at is not None:
+            if expires_at > now:
+                return True
+            del self._missing[key]
+
+        if self._disk_cache is not None and ("missing",) + key in self._disk_cache:
+            self._remember_missing(key, now)
+            return True
+
+        return False
+
+    def _mark_missing(self, key: Tuple[str, str]):
+        """Record a definite 404 so repeat lookups skip the API"""
+        self._remember_missing(key, time.time())
+        if self._disk_cache is not None:
+            self._disk_cache.set(("missing",) + key, True, expire=self.MISSING_TTL)
+
+    def _remember_missing(self, key: Tuple[str, str], now: float):
+        """Insert into the in-memory miss set, evicting the oldest entry when full"""
+        self._missing[key] = now + self.MISSING_TTL
+        self._missing.move_to_end(key)
+        while len(self._missing) > self.cache_size:
+            self._missing.popitem(last=False)
+
+    def _get_cached(self, key: Tuple[str, str, bool]) -> Optional[Dict[str, Any]]:
+        """Return a cached lookup result from memory, then disk"""
+        now = time.time()
+        entry = self._memory_cache.get(key)
+        if entry is not None:
+            expires_at, data = entry
+            if expires_at > now:
+                self._memory_cache.move_to_end(key)
+                return dict(data)
+            del self._memory_cache[key]
+
+        if self._disk_cache is not None:
+            data = self._disk_cache.get(key)
+            if data is not None:
+                self._remember(key, data, now)
+                return dict(data)
+
+        return None
+
+    def _store_cached(self, key: Tuple[str, str, bool], data: Dict[str, Any]):
+        """Cache a lookup result in memory and, if configured, on disk"""
+        self._remember(key, data, time.time())
+        if self._disk_cache is not None:
+            self._disk_cache.set(key, data, expire=self.cache_ttl)
+
+    def _remember(self, key: Tuple[str, str, bool], data: Dict[str, Any], now: float):
+        """Insert into the in-memory LRU, evicting the oldest entry when full"""
+        self._memory_cache[key] = (now + self.cache_ttl, dict(data))
+        self._memory_cache.move_to_end(key)
+        while len(self._memory_cache) > self.cache_size:
+            self._memory_cache.popitem(last=False)
+
+    async def get_cards_bulk(
+        self,
+        queries: List[Tuple[str, str]],
+        session: Optional[Any] = None,
+    ) -> List[Any]:
+        """Look up many (card_name, set_name) pairs concurrently.
+
+        Results are returned in query order; a failed lookup yields its exception.
+        """
+        if session is None:
+            session = await self._get_session()
+
+        return await asyncio.gather(
+            *(self.get_card_data(name, set_name, session) for name, set_name in queries),
+            return_exceptions=True,
+        )
+
+    async def _request_card(
+        self,
+        session: Any,
+        url: str,
+        params: Dict[str, Any],
+    ) -> Tuple[int, Optional[Dict[str, Any]]]:
+        """Run one request and return (status, card); search results yield the first match
+
+        When an earlier response for the same request left an ETag in the disk
+        cache, the request is made conditional and a 304 reuses the stored card.
+        """
+        etag_key = ("etag", url, tuple(sorted(params.items())))
+        stored = self._disk_cache.get(etag_key) if self._disk_cache is not None else None
+        # Only advertise brotli when a decoder for it is installed
+        headers = {"Accept-Encoding": _ACCEPT_ENCODING}
+        if stored:
+            headers["If-None-Match"] = stored[0]
+
+        for attempt in range(self.MAX_RETRIES + 1):
+            if attempt:
+                await rate_limiter.acquire(self.endpoint_name)
+
+            try:
+                status, response_headers, body = await self._get(session, url, params, headers)
+
+                if status == 304 and stored:
+                    rate_limiter.report_success(self.endpoint_name)
+                    return 200, stored[1]
+
+                if status == 429:
+                    rate_limiter.report_error(self.endpoint_name, is_rate_limit_error=True)
+                    retry_after = self._retry_after(response_headers.get("Retry-After"))
+                elif status != 200:
+                    if status >= 500:
+                        rate_limiter.report_error(self.endpoint_name)
+                    return status, None
                 else:
-                    return "Serialized"
-
-            # Special foil treatments
-            special_foils = [
-                "Galaxy Foil",
-                "Oil Slick",
-                "Surge Foil",
-                "Halo Foil",
-                "Confetti Foil",
-                "Double Rainbow",
-                "Step-and-Compleat",
-            ]
-            for special in special_foils:
-                if special in finish_parts:
-                    # These are complete treatments on their own
-                    if "Textured" in finish_parts and special == "Oil Slick":
-                        return "Oil Slick Raised Foil"
-                    return special
-
-            # Frame treatments with foil
-            if "Showcase" in finish_parts and "Foil" in finish_parts:
-                return "Showcase Foil"
-            elif "Extended Art" in finish_parts and "Foil" in finish_parts:
-                return "Extended Art Foil"
-            elif "Borderless" in finish_parts and "Foil" in finish_parts:
-                return "Borderless Foil"
-            elif "Full Art" in finish_parts and "Foil" in finish_parts:
-                return "Full Art Foil"
-            elif "Etched" in finish_parts and "Foil" in finish_parts:
-                return "Etched Foil"
-            elif "Textured Foil" in finish_parts:
-                return "Textured Foil"
-
-            # Special sets/series
-            special_priority = [
-                "Masterpiece",
-                "Secret Lair",
-                "From the Vault",
-                "Mystical Archive",
-                "Multiverse Legends",
-                "Neon Ink",
-                "Phyrexian",
-                "Schematic",
-            ]
-
-            for special in special_priority:
-                if special in finish_parts:
-                    # Add foil designation if applicable
-                    if any(f in finish_parts for f in ["Foil", "Foil-Etched"]):
-                        return f"{special} Foil"
-                    return special
-
-            # Return the most specific/important finish
-            priority_order = [
-                "Showcase Foil",
-                "Extended Art Foil",
-                "Borderless Foil",
-                "Showcase",
-                "Extended Art",
-                "Borderless",
-                "Full Art",
-                "Etched Foil",
-                "Etched",
-                "Textured Foil",
-                "Prerelease Foil",
-                "Judge Foil",
-                "Buy-a-Box Foil",
-                "From the Vault Foil",
-                "Spellbook",
-                "Foil",
-                "Mythic",
-                "Gold Border",
-                "Silver Border",
-                "Variant",
-                "Promo",
-            ]
-
-            for priority_finish in priority_order:
-                if priority_finish in finish_parts:
-                    return priority_finish
-
-            # Fallback to first finish
-            return finish_parts[0]
+                    rate_limiter.report_success(self.endpoint_name)
+                    data = _json_loads(body)
 
-    def _extract_features(self, card: Dict[str, Any]) -> List[str]:
-        """Extract special features/characteristics from MTG card data - FIXED VERSION"""
-        features = []
-
-        # Frame effects - these are characteristics, not set names
-        frame_effects = card.get("frame_effects", [])
-        effect_mapping = {
-            "showcase": "Showcase",
-            "extendedart": "Extended Art",
-            "borderless": "Borderless",
-            "fullart": "Full Art",
-            "textless": "Textless",
-            "inverted": "Inverted",
-            "companion": "Companion",
-            "etched": "Etched",
-            "shatteredglass": "Shattered Glass",
-            "convertdfc": "Transform",
-            "fandfc": "Modal Double-Faced",
-            "upsidedowndfc": "Upside Down",
-            "lesson": "Lesson",
-            "miracle": "Miracle",
-            "nyxtouched": "Enchantment Creature",
-            "draft": "Draft Card",
-            "devoid": "Devoid",
-            "tombstone": "Flashback",
-            "colorshifted": "Colorshifted",
-            "sunmoondfc": "Daybound/Nightbound",
-            "mooneldrazidfc": "Meld",
-            "originpwdfc": "Origin",
-            "waxingandwaningmoondfc": "Disturb",
-            "spaceic": "Space-ic",
-        }
+                    if data.get("object") == "list":
+                        cards = data.get("data", [])
+                        card = cards[0] if cards else None  # Take first match
+                    else:
+                        card = data
 
-        for effect in frame_effects:
-            if effect in effect_mapping:
-                features.append(effect_mapping[effect])
-
-        # Promo information
-        if card.get("promo"):
-            promo_types = card.get("promo_types", [])
-            promo_mapping = {
-                "prerelease": "Prerelease",
-                "stamped": "Stamped",
-                "datestamped": "Date Stamped",
-                "buyabox": "Buy-a-Box Promo",
-                "bundle": "Bundle Promo",
-                "judgegift": "Judge Gift",
-                "fnm": "FNM Promo",
-                "gameday": "Game Day Promo",
-                "release": "Release Promo",
-                "convention": "Convention Promo",
-                "instore": "Store Championship",
-                "league": "League Promo",
-                "playerrewards": "Player Rewards",
-                "gateway": "Gateway Promo",
-                "wizardsplay": "Wizards Play Network",
-                "openhouse": "Open House Promo",
-                "tourney": "Tournament Promo",
-                "nationalsqualifier": "Nationals Qualifier",
-                "championshipqualifier": "Championship Qualifier",
-                "premiereshop": "Premiere Shop",
-                "grandprix": "Grand Prix Promo",
-                "protour": "Pro Tour Promo",
-                "worlds": "Worlds Promo",
-                "wpnstamped": "WPN Promo",
-                "playpromo": "Play Promo",
-                "planeswalkerstamped": "Planeswalker Stamped",
-                "setpromo": "Set Promo",
-                "promopack": "Promo Pack",
-                "themepack": "Theme Booster",
-                "brawldeck": "Brawl Deck",
-                "commanderparty": "Commander Party",
-            }
-
-            for promo in promo_types:
-                if promo in promo_mapping:
-                    features.append(promo_mapping[promo])
-
-            # If promo but no specific type
-            if not promo_types and "Promo" not in features:
-                features.append("Promo")
-
-        # REMOVED: Masterpiece series and special set names
-        # These belong in the Set field, not Features
-
-        set_name = card.get("set_name", "").lower()
-        set_type = card.get("set_type", "")
-
-        # Only add set TYPE if it's a characteristic, not a set name
-        if set_type == "funny":
-            features.append("Un-set")
-
-        # Frame information
-        frame = card.get("frame", "")
-        frame_features = {
-            "1993": "Alpha Frame",
-            "1997": "Classic Frame",
-            "2003": "Modern Frame",
-            "2015": "M15 Frame",
-            "future": "Future Frame",
-            "timeshifted": "Timeshifted Frame",
-        }
+                    etag = response_headers.get("ETag")
+                    if etag and card is not None and self._disk_cache is not None:
+                        self._disk_cache.set(etag_key, (etag, card))
 
-        if frame in frame_features:
-            features.append(frame_features[frame])
-
-        # Border type - these are characteristics
-        border = card.get("border_color", "")
-        if border == "gold":
-            features.append("Gold Border")
-        elif border == "silver":
-            features.append("Silver Border")
-        elif border == "white":
-            features.append("White Border")
-
-        # Special printings
-        keywords = card.get("keywords", [])
-        special_keywords = {
-            "partner": "Partner",
-            "companion": "Companion",
-            "mutate": "Mutate",
-            "adventure": "Adventure",
-            "aftermath": "Aftermath",
-            "escape": "Escape",
-            "foretell": "Foretell",
-            "modal double-faced": "Modal Double-Faced",
-            "transform": "Transform",
-            "meld": "Meld",
-            "flip": "Flip",
-            "split": "Split",
-            "fuse": "Fuse",
-            "aftermath": "Aftermath",
-            "prototype": "Prototype",
-            "battle": "Battle",
-            "case": "Case",
-            "class": "Class",
-            "room": "Room",
-            "saga": "Saga",
-            "planeswalker": "Planeswalker",
-        }
-
-        for keyword in keywords:
-            keyword_lower = keyword.lower()
-            if keyword_lower in special_keywords:
-                features.append(special_keywords[keyword_lower])
-
-        # Card layout special types
-        layout = card.get("layout", "")
-        layout_features = {
-            "split": "Split Card",
-            "flip": "Flip Card",
-            "transform": "Double-Faced Card",
-            "modal_dfc": "Modal Double-Faced Card",
-            "meld": "Meld Card",
-            "leveler": "Leveler",
-            "class": "Class Card",
-            "saga": "Saga",
-            "adventure": "Adventure Card",
-            "mutate": "Mutate Card",
-            "prototype": "Prototype Card",
-            "battle": "Battle Card",
-            "case": "Case Card",
-            "room": "Room Card",
-            "planar": "Planechase Card",
-            "scheme": "Archenemy Card",
-            "vanguard": "Vanguard Card",
-            "token": "Token",
-            "emblem": "Emblem",
-            "art_series": "Art Series",
-            "reversible_card": "Reversible Card",
-        }
+                    return status, card
 
-        if layout in layout_features:
-            features.append(layout_features[layout])
-
-        # Oversized cards
-        if card.get("oversized"):
-            features.append("Oversized")
-
-        # Reserved list
-        if card.get("reserved"):
-            features.append("Reserved List")
-
-        # Full art lands
-        if card.get("full_art"):
-            features.append("Full Art Land")
-
-        # Textless
-        if card.get("textless"):
-            features.append("Textless")
-
-        # Story spotlight
-        if card.get("story_spotlight"):
-            features.append("Story Spotlight")
-
-        # Special card variations
-        if card.get("variation"):
-            features.append("Variant")
-
-        # Unique/Special printings
-        collector_number = card.get("collector_number", "")
-
-        # Numbered cards (serialized)
-        if "/" in collector_number and any(
-            num in collector_number for num in ["999", "500", "250", "100", "50"]
-        ):
-            features.append("Numbered")
-
-        # Special numbering schemes
-        if collector_number:
-            if collector_number.endswith("★"):
-                features.append("Star Number")
-            elif collector_number.endswith("†"):
-                features.append("Dagger Number")
-            elif any(letter in collector_number for letter in ["a", "b", "c", "d", "e"]):
-                features.append("Alternate Art")
-            elif collector_number.startswith("F"):
-                features.append("Foil-Only")
-
-        # Special mechanics from oracle text
-        oracle_text = card.get("oracle_text", "").lower()
-        special_mechanics = {
-            "draft matters": "Draft Matters",
-            "conspiracy": "Conspiracy",
-            "monarch": "Monarch",
-            "city's blessing": "Ascend",
-            "commander": "Commander",
-            "dungeon": "Dungeon",
-            "daybound": "Daybound/Nightbound",
-            "disturb": "Disturb",
-            "blood": "Blood Token",
-            "treasure": "Treasure",
-            "clue": "Investigate",
-            "food": "Food Token",
-            "role": "Role Token",
-            "sticker": "Sticker",
-            "attraction": "Attraction",
-            "contraption": "Contraption",
-            "energy": "Energy",
-            "experience": "Experience Counter",
-            "poison": "Poison",
-            "proliferate": "Proliferate",
-            "infect": "Infect",
-            "toxic": "Toxic",
-            "corrupted": "Corrupted",
-            "compleated": "Compleated",
-        }
-
-        for mechanic, feature in special_mechanics.items():
-            if mechanic in oracle_text and feature not in features:
-                features.append(feature)
+            except _REQUEST_ERRORS as e:
+                rate_limiter.report_error(self.endpoint_name)
+                logger.error(f"Scryfall API error: {e}")
+                return 0, None
 
-        # Arena/Digital only
-        if card.get("digital"):
-            features.append("Digital Only")
+            # Rate limited: back off for as long as the server asked, then retry
+            if attempt == self.MAX_RETRIES:
+                logger.error(f"Scryfall rate limit persisted after {self.MAX_RETRIES} retries")
+                return 429, None
+            logger.warning(f"Scryfall rate limited, retrying in {retry_after:.1f}s")
+            await asyncio.sleep(retry_after)
 
-        if "arena" in card.get("games", []) and len(card.get("games", [])) == 1:
-            features.append("Arena Exclusive")
+        return 429, None  # Unreachable: the final attempt returns above
 
-        # Special artist variations
-        artist = card.get("artist", "").lower()
-        if "dan frazier" in artist and "mox" in card.get("name", "").lower():
-            features.append("Original Art")
+    async def _get(
+        self,
+        session: Any,
+        url: str,
+        params: Dict[str, Any],
+        headers: Dict[str, str],
+    ) -> Tuple[int, Any, Optional[bytes]]:
+        """GET with an aiohttp or httpx session; returns (status, headers, body).
+
+        The body is only read for 200 responses, and is parsed by the caller
+        rather than via response.json().
+        """
+        if httpx is not None and isinstance(session, httpx.AsyncClient):
+            response = await session.get(url, params=params, headers=headers)
+            body = response.content if response.status_code == 200 else None
+            return response.status_code, response.headers, body
+
+        async with session.get(url, params=params, headers=headers) as response:
+            body = await response.read() if response.status == 200 else None
+            return response.status, response.headers, body
+
+    @staticmethod
+    def _retry_after(value: Optional[str]) -> float:
+        """Seconds to wait from a Retry-After header (delta-seconds form only)"""
+        try:
+            return max(float(value), 0.0)
+        except (TypeError, ValueError):
+            return 1.0
+
+    def _price_card(self, card: Dict[str, Any], is_foil: bool) -> Optional[Dict[str, Any]]:
+        """Pick the Near Mint price for a card and format it, or None if unpriced"""
+        prices = card.get("prices", {})
+
+        # Select appropriate NEAR MINT price
+        # Scryfall prices are for Near Mint condition by default
+        if is_foil and "usd_foil" in prices:
+            usd_price = float(prices.get("usd_foil", 0) or 0)
+            logger.info(f"      Using Near Mint foil price: ${usd_price}")
+        else:
+            usd_price = float(prices.get("usd", 0) or 0)
+            logger.info(f"      Using Near Mint regular price: ${usd_price}")
 
-        # Un-set specific
-        if set_type == "funny":
-            # Check for specific Un-set mechanics
-            if "acorn" in card.get("security_stamp", ""):
-                features.append("Acorn Card")
-            elif "oval" in card.get("security_stamp", ""):
-                features.append("Eternal Legal")
+        if usd_price > 0:
+            return self._format_card_data(card, usd_price, is_foil)
+        return None
 
-        # Remove duplicates while preserving order
-        seen = set()
-        unique_features = []
-        for feature in features:
-            if feature not in seen:
-                seen.add(feature)
-                unique_features.append(feature)
+    def _extract_finish(self, card: Dict[str, Any], is_foil: bool) -> str:
+        """Extract finish information from MTG card data"""
+        return extract_finish(card, is_foil)
 
-        return unique_features
+    def _extract_features(self, card: Dict[str, Any]) -> List[str]:
+        """Extract special features/characteristics from MTG card data"""
+        return extract_features(card)
 
     def _format_card_data(
         self, card: Dict[str, Any], market_price: float, is_foil: bool
     ) -> Dict[str, Any]:
         """Format MTG card data with enhanced fields"""
+        g = card.get  # Bound once; read for every field below
+
         # Scryfall provides purchase URLs
-        purchase_urls = card.get("purchase_uris", {})
+        purchase_urls = g("purchase_uris", {})
         tcgplayer_url = purchase_urls.get("tcgplayer", "")
 
         # Extract finish and features from API data
-        finish = self._extract_finish(card, is_foil)
-        features = self._extract_features(card)
+        finish, features = extract_metadata(card, is_foil)
 
         # Log what we're getting
         logger.info(f"   📊 Scryfall API - TCGPlayer data:")
@@ -730,49 +478,49 @@ class ScryfallClient:
         logger.info(f"      - TCGPlayer URL: {tcgplayer_url}")
 
         # Get game mechanics
-        keywords = card.get("keywords", [])
+        keywords = g("keywords", [])
 
         # Color information
-        colors = card.get("colors", [])
-        color_identity = card.get("color_identity", [])
+        colors = g("colors", [])
+        color_identity = g("color_identity", [])
 
         return {
             "api_price": market_price,
             "price_source": "Scryfall API - Near Mint",  # Added Near Mint
-            "scryfall_id": card.get("id"),
-            "oracle_id": card.get("oracle_id"),
-            "multiverse_ids": card.get("multiverse_ids", []),
-            "tcgplayer_id": card.get("tcgplayer_id"),
-            "cardmarket_id": card.get("cardmarket_id"),
-            "oracle_text": card.get("oracle_text", ""),
-            "mana_cost": card.get("mana_cost", ""),
-            "cmc": card.get("cmc", 0),
-            "type_line": card.get("type_line", ""),
+            "scryfall_id": g("id"),
+            "oracle_id": g("oracle_id"),
+            "multiverse_ids": g("multiverse_ids", []),
+            "tcgplayer_id": g("tcgplayer_id"),
+            "cardmarket_id": g("cardmarket_id"),
+            "oracle_text": g("oracle_text", ""),
+            "mana_cost": g("mana_cost", ""),
+            "cmc": g("cmc", 0),
+            "type_line": g("type_line", ""),
             "colors": colors,
             "color_identity": color_identity,
             "keywords": keywords,
-            "power": card.get("power"),  # ADDED - for creatures
-            "toughness": card.get("toughness"),  # ADDED - for creatures
-            "loyalty": card.get("loyalty"),  # For planeswalkers
-            "artist": card.get("artist"),
-            "rarity_confirmed": card.get("rarity"),
-            "set_confirmed": card.get("set_name"),
-            "set_code": card.get("set"),
-            "collector_number": card.get("collector_number"),
-            "release_date": card.get("released_at"),  # IMPORTANT - this needs to be passed through
-            "reprint": card.get("reprint", False),
-            "frame": card.get("frame"),
-            "full_art": card.get("full_art", False),
-            "textless": card.get("textless", False),
-            "story_spotlight": card.get("story_spotlight", False),
-            "oversized": card.get("oversized", False),  # ADDED - for card size detection
+            "power": g("power"),  # ADDED - for creatures
+            "toughness": g("toughness"),  # ADDED - for creatures
+            "loyalty": g("loyalty"),  # For planeswalkers
+            "artist": g("artist"),
+            "rarity_confirmed": g("rarity"),
+            "set_confirmed": g("set_name"),
+            "set_code": g("set"),
+            "collector_number": g("collector_number"),
+            "release_date": g("released_at"),  # IMPORTANT - this needs to be passed through
+            "reprint": g("reprint", False),
+            "frame": g("frame"),
+            "full_art": g("full_art", False),
+            "textless": g("textless", False),
+            "story_spotlight": g("story_spotlight", False),
+            "oversized": g("oversized", False),  # ADDED - for card size detection
             "finish_api": finish,  # From API data
             "features_api": features,  # From API data
-            "edhrec_rank": card.get("edhrec_rank"),
-            "penny_rank": card.get("penny_rank"),
-            "flavor_text": card.get("flavor_text"),
-            "legalities": card.get("legalities", {}),
-            "games": card.get("games", []),
+            "edhrec_rank": g("edhrec_rank"),
+            "penny_rank": g("penny_rank"),
+            "flavor_text": g("flavor_text"),
+            "legalities": g("legalities", {}),
+            "games": g("games", []),
             "data_source": "Scryfall API",
             "tcgplayer_url": tcgplayer_url,  # Direct URL from API
             "tcgplayer_link": tcgplayer_url,  # Also set as tcgplayer_link for consistency
@@ -0,0 +1,783 @@
+"""Finish and feature extraction for Scryfall card objects
+
+Pure functions over the card dict (no I/O), kept apart from the HTTP client so
+this hot path can be compiled with mypyc (``mypyc src/api/scryfall_extract.py``)
+without changing any imports.
+"""
+
+import re
+from typing import Any, Dict, Iterable, List, Tuple
+
+# Lookup tables, kept at module scope so they are built once instead of per card.
+_FRAME_TREATMENTS = {
+    # Standard treatments
+    "showcase": "Showcase",
+    "extendedart": "Extended Art",
+    "borderless": "Borderless",
+    "fullart": "Full Art",
+    "textless": "Textless",
+    "inverted": "Inverted",
+    "etched": "Etched",
+    # Special frame types
+    "fuse": "Fuse",
+    "companion": "Companion",
+    "nyxtouched": "Nyxtouched",
+    "miracle": "Miracle",
+    "lesson": "Lesson",
+    "snow": "Snow",
+    "legendary": "Legendary",
+    "devoid": "Devoid",
+    "tombstone": "Tombstone",
+    "colorshifted": "Colorshifted",
+    # Double-faced cards
+    "sunmoondfc": "Double-Faced",
+    "mooneldrazidfc": "Double-Faced",
+    "originpwdfc": "Double-Faced",
+    "waxingandwaningmoondfc": "Double-Faced",
+    "convertdfc": "Double-Faced",
+    # Newer treatments
+    "shatteredglass": "Shattered Glass",
+    "spaceic": "Spaceic",
+    "upsidedowndfc": "Upside Down",
+}
+
+_SPECIAL_FOIL_TREATMENTS = {
+    # Set-specific foils
+    "unfinity": "Galaxy Foil",
+    "wilds of eldraine": "Confetti Foil",
+    "march of the machine": "Halo Foil",
+    "phyrexia: all will be one": "Oil Slick",
+    "the brothers' war": "Double Rainbow",
+    # Product-specific foils
+    "warhammer 40,000": "Surge Foil",
+    "doctor who": "Surge Foil",
+    "lord of the rings": "Surge Foil",
+    "fallout": "Surge Foil",
+    "assassin's creed": "Surge Foil",
+    "final fantasy": "Surge Foil",
+    # Special series
+    "secret lair": "Secret Lair",
+    "from the vault": "From the Vault",
+    "masterpiece": "Masterpiece",
+    "mystical archive": "Mystical Archive",
+    "secret lair drop": "Secret Lair",
+}
+
+# Set-specific foils that stand on their own without a trailing "Foil"
+_STANDALONE_FOIL_TREATMENTS = frozenset(
+    {
+        "Galaxy Foil",
+        "Oil Slick",
+        "Surge Foil",
+        "Halo Foil",
+        "Confetti Foil",
+        "Double Rainbow",
+    }
+)
+
+_PROMO_FOIL_TYPES = {
+    "prerelease": "Prerelease Foil",
+    "datestamped": "Date Stamped Foil",
+    "stamped": "Stamped Foil",
+    "setpromo": "Set Promo Foil",
+    "buyabox": "Buy-a-Box Foil",
+    "bundle": "Bundle Foil",
+    "fnm": "FNM Foil",
+    "judgegift": "Judge Foil",
+    "arenaleague": "Arena League Foil",
+    "gameday": "Game Day Foil",
+    "release": "Release Foil",
+    "convention": "Convention Foil",
+    "tourney": "Tournament Foil",
+    "instore": "Store Championship Foil",
+    "openhouse": "Open House Foil",
+    "planeswalkerstamped": "Planeswalker Stamped Foil",
+    "wpnstamped": "WPN Foil",
+    "playpromo": "Play Promo Foil",
+}
+
+_SPECIAL_SET_FINISHES = {
+    "masterpiece": "Masterpiece",
+    "from_the_vault": "From the Vault",
+    "spellbook": "Spellbook",
+    "signature_spellbook": "Signature Spellbook",
+    "secret_lair": "Secret Lair",
+    "box": "Box Topper",
+    "memorabilia": "Memorabilia",
+    "masters": "Masters",
+    "duel_deck": "Duel Deck",
+    "commander": "Commander",
+    "planechase": "Planechase",
+    "archenemy": "Archenemy",
+    "vanguard": "Vanguard",
+    "funny": "Un-set",
+    "treasure_chest": "Treasure Chest",
+    "promo": "Promo",
+}
+
+_SPECIAL_TREATMENTS = {
+    # Bonus sheets
+    "mystical archive": "Mystical Archive",
+    "multiverse legends": "Multiverse Legends",
+    "retro artifacts": "Retro Artifacts",
+    "enchanting tales": "Enchanting Tales",
+    "tales of middle-earth": "Tales of Middle-earth",
+    # Special frames
+    "neon": "Neon Ink",
+    "schematic": "Schematic",
+    "blueprint": "Blueprint",
+    "stained glass": "Stained Glass",
+    "comic book": "Comic Book",
+    "anime": "Anime",
+    # Step treatments
+    "step-and-compleat": "Step-and-Compleat",
+    "phyrexian": "Phyrexian",
+}
+
+_SPECIAL_FOILS = (
+    "Galaxy Foil",
+    "Oil Slick",
+    "Surge Foil",
+    "Halo Foil",
+    "Confetti Foil",
+    "Double Rainbow",
+    "Step-and-Compleat",
+)
+
+_SPECIAL_PRIORITY = (
+    "Masterpiece",
+    "Secret Lair",
+    "From the Vault",
+    "Mystical Archive",
+    "Multiverse Legends",
+    "Neon Ink",
+    "Phyrexian",
+    "Schematic",
+)
+
+_PRIORITY_ORDER = (
+    "Showcase Foil",
+    "Extended Art Foil",
+    "Borderless Foil",
+    "Showcase",
+    "Extended Art",
+    "Borderless",
+    "Full Art",
+    "Etched Foil",
+    "Etched",
+    "Textured Foil",
+    "Prerelease Foil",
+    "Judge Foil",
+    "Buy-a-Box Foil",
+    "From the Vault Foil",
+    "Spellbook",
+    "Foil",
+    "Mythic",
+    "Gold Border",
+    "Silver Border",
+    "Variant",
+    "Promo",
+)
+
+# Collector-number checks. A "/" plus a print-run size anywhere in the number
+# marks a serialized card; the features check also accepts "50" (which covers
+# "250" and "500"). Any of a-e marks an alternate-art printing.
+_SERIALIZED_RE = re.compile(r"^(?=.*/).*(?:999|500|250|100)")
+_NUMBERED_RE = re.compile(r"^(?=.*/).*(?:999|100|50)")
+_ALT_ART_RE = re.compile(r"[a-e]")
+
+# Border colors that add their own finish part
+_SPECIAL_BORDERS = frozenset({"gold", "silver"})
+
+# Set types where a foil mythic is called out as its own finish
+_MYTHIC_FOIL_SET_TYPES = frozenset({"masters", "core", "expansion"})
+
+# Every finish label this module can emit gets one bit, so membership checks on
+# the accumulated finish become integer ops instead of list scans.
+_FINISH_LABELS = tuple(
+    dict.fromkeys(
+        [
+            *_FRAME_TREATMENTS.values(),
+            *_SPECIAL_FOIL_TREATMENTS.values(),
+            "From the Vault Foil",
+            "Foil",
+            "Etched Foil",
+            "Textured Foil",
+            *_PROMO_FOIL_TYPES.values(),
+            *_SPECIAL_SET_FINISHES.values(),
+            "Variant",
+            "Oversized",
+            "Serialized",
+            "Retro Frame",
+            "Mythic",
+            *_SPECIAL_TREATMENTS.values(),
+            "Gold Border",
+            "Silver Border",
+        ]
+    )
+)
+_FINISH_BITS = {label: 1 << index for index, label in enumerate(_FINISH_LABELS)}
+
+_FLAG_SHOWCASE = _FINISH_BITS["Showcase"]
+_FLAG_EXTENDED_ART = _FINISH_BITS["Extended Art"]
+_FLAG_BORDERLESS = _FINISH_BITS["Borderless"]
+_FLAG_FULL_ART = _FINISH_BITS["Full Art"]
+_FLAG_ETCHED = _FINISH_BITS["Etched"]
+_FLAG_FOIL = _FINISH_BITS["Foil"]
+_FLAG_TEXTURED_FOIL = _FINISH_BITS["Textured Foil"]
+_FLAG_SERIALIZED = _FINISH_BITS["Serialized"]
+_FLAG_DOUBLE_RAINBOW = _FINISH_BITS["Double Rainbow"]
+_FLAG_OIL_SLICK = _FINISH_BITS["Oil Slick"]
+_FLAG_MYTHIC = _FINISH_BITS["Mythic"]
+
+# Priority lists resolved to (bit, label) pairs; labels that are never emitted
+# as a single part (e.g. "Showcase Foil") have no bit and are dropped.
+_SPECIAL_FOIL_BITS = tuple(
+    (_FINISH_BITS[label], label) for label in _SPECIAL_FOILS if label in _FINISH_BITS
+)
+_SPECIAL_PRIORITY_BITS = tuple(
+    (_FINISH_BITS[label], label) for label in _SPECIAL_PRIORITY if label in _FINISH_BITS
+)
+_PRIORITY_ORDER_BITS = tuple(
+    (_FINISH_BITS[label], label) for label in _PRIORITY_ORDER if label in _FINISH_BITS
+)
+
+# Frame treatment + foil combinations, in the order they win when several apply
+_FOIL_COMBOS = (
+    (_FLAG_SHOWCASE, "Showcase Foil"),
+    (_FLAG_EXTENDED_ART, "Extended Art Foil"),
+    (_FLAG_BORDERLESS, "Borderless Foil"),
+    (_FLAG_FULL_ART, "Full Art Foil"),
+    (_FLAG_ETCHED, "Etched Foil"),
+)
+_FOIL_COMBO_MASK = _FLAG_FOIL | sum(bit for bit, _ in _FOIL_COMBOS)  # bits are distinct
+
+
+def _build_foil_combo_dispatch() -> Dict[int, str]:
+    """Map every foil + frame-treatment bit combination to its winning label"""
+    frame_bits = [bit for bit, _ in _FOIL_COMBOS]
+    dispatch = {}
+    for subset in range(1 << len(frame_bits)):
+        mask = _FLAG_FOIL
+        for index, bit in enumerate(frame_bits):
+            if subset & (1 << index):
+                mask |= bit
+        for bit, label in _FOIL_COMBOS:
+            if mask & bit:
+                dispatch[mask] = label
+                break
+    return dispatch
+
+
+# (flags & _FOIL_COMBO_MASK) -> label; masks without Foil are absent
+_FOIL_COMBO_DISPATCH = _build_foil_combo_dispatch()
+
+_EFFECT_MAPPING = {
+    "showcase": "Showcase",
+    "extendedart": "Extended Art",
+    "borderless": "Borderless",
+    "fullart": "Full Art",
+    "textless": "Textless",
+    "inverted": "Inverted",
+    "companion": "Companion",
+    "etched": "Etched",
+    "shatteredglass": "Shattered Glass",
+    "convertdfc": "Transform",
+    "fandfc": "Modal Double-Faced",
+    "upsidedowndfc": "Upside Down",
+    "lesson": "Lesson",
+    "miracle": "Miracle",
+    "nyxtouched": "Enchantment Creature",
+    "draft": "Draft Card",
+    "devoid": "Devoid",
+    "tombstone": "Flashback",
+    "colorshifted": "Colorshifted",
+    "sunmoondfc": "Daybound/Nightbound",
+    "mooneldrazidfc": "Meld",
+    "originpwdfc": "Origin",
+    "waxingandwaningmoondfc": "Disturb",
+    "spaceic": "Space-ic",
+}
+
+_PROMO_MAPPING = {
+    "prerelease": "Prerelease",
+    "stamped": "Stamped",
+    "datestamped": "Date Stamped",
+    "buyabox": "Buy-a-Box Promo",
+    "bundle": "Bundle Promo",
+    "judgegift": "Judge Gift",
+    "fnm": "FNM Promo",
+    "gameday": "Game Day Promo",
+    "release": "Release Promo",
+    "convention": "Convention Promo",
+    "instore": "Store Championship",
+    "league": "League Promo",
+    "playerrewards": "Player Rewards",
+    "gateway": "Gateway Promo",
+    "wizardsplay": "Wizards Play Network",
+    "openhouse": "Open House Promo",
+    "tourney": "Tournament Promo",
+    "nationalsqualifier": "Nationals Qualifier",
+    "championshipqualifier": "Championship Qualifier",
+    "premiereshop": "Premiere Shop",
+    "grandprix": "Grand Prix Promo",
+    "protour": "Pro Tour Promo",
+    "worlds": "Worlds Promo",
+    "wpnstamped": "WPN Promo",
+    "playpromo": "Play Promo",
+    "planeswalkerstamped": "Planeswalker Stamped",
+    "setpromo": "Set Promo",
+    "promopack": "Promo Pack",
+    "themepack": "Theme Booster",
+    "brawldeck": "Brawl Deck",
+    "commanderparty": "Commander Party",
+}
+
+_FRAME_FEATURES = {
+    "1993": "Alpha Frame",
+    "1997": "Classic Frame",
+    "2003": "Modern Frame",
+    "2015": "M15 Frame",
+    "future": "Future Frame",
+    "timeshifted": "Timeshifted Frame",
+}
+
+_SPECIAL_KEYWORDS = {
+    "partner": "Partner",
+    "companion": "Companion",
+    "mutate": "Mutate",
+    "adventure": "Adventure",
+    "aftermath": "Aftermath",
+    "escape": "Escape",
+    "foretell": "Foretell",
+    "modal double-faced": "Modal Double-Faced",
+    "transform": "Transform",
+    "meld": "Meld",
+    "flip": "Flip",
+    "split": "Split",
+    "fuse": "Fuse",
+    "prototype": "Prototype",
+    "battle": "Battle",
+    "case": "Case",
+    "class": "Class",
+    "room": "Room",
+    "saga": "Saga",
+    "planeswalker": "Planeswalker",
+}
+
+_LAYOUT_FEATURES = {
+    "split": "Split Card",
+    "flip": "Flip Card",
+    "transform": "Double-Faced Card",
+    "modal_dfc": "Modal Double-Faced Card",
+    "meld": "Meld Card",
+    "leveler": "Leveler",
+    "class": "Class Card",
+    "saga": "Saga",
+    "adventure": "Adventure Card",
+    "mutate": "Mutate Card",
+    "prototype": "Prototype Card",
+    "battle": "Battle Card",
+    "case": "Case Card",
+    "room": "Room Card",
+    "planar": "Planechase Card",
+    "scheme": "Archenemy Card",
+    "vanguard": "Vanguard Card",
+    "token": "Token",
+    "emblem": "Emblem",
+    "art_series": "Art Series",
+    "reversible_card": "Reversible Card",
+}
+
+_SPECIAL_MECHANICS = {
+    "draft matters": "Draft Matters",
+    "conspiracy": "Conspiracy",
+    "monarch": "Monarch",
+    "city's blessing": "Ascend",
+    "commander": "Commander",
+    "dungeon": "Dungeon",
+    "daybound": "Daybound/Nightbound",
+    "disturb": "Disturb",
+    "blood": "Blood Token",
+    "treasure": "Treasure",
+    "clue": "Investigate",
+    "food": "Food Token",
+    "role": "Role Token",
+    "sticker": "Sticker",
+    "attraction": "Attraction",
+    "contraption": "Contraption",
+    "energy": "Energy",
+    "experience": "Experience Counter",
+    "poison": "Poison",
+    "proliferate": "Proliferate",
+    "infect": "Infect",
+    "toxic": "Toxic",
+    "corrupted": "Corrupted",
+    "compleated": "Compleated",
+}
+
+
+def _compile_substring_scanner(patterns: Iterable[str]) -> "re.Pattern[str]":
+    """Compile literal substrings into one regex that reports every occurrence.
+
+    The zero-width lookahead lets matches at different positions overlap. At
+    any one position only the longest alternative is reported, so a shorter
+    pattern there is hidden inside the longer match; _scan_in_order recovers it.
+    """
+    alternatives = sorted(patterns, key=len, reverse=True)
+    return re.compile("(?=(" + "|".join(re.escape(p) for p in alternatives) + "))")
+
+
+def _scan_in_order(scanner: "re.Pattern[str]", mapping: Dict[str, str], *texts: str) -> List[str]:
+    """Return the mapped labels for patterns found in texts, in mapping order."""
+    found = {m.group(1) for text in texts if text for m in scanner.finditer(text)}
+    if not found:
+        return []
+    # A pattern hidden by a longer match at the same position is a prefix of
+    # that match, so containment in any hit means it occurs in the text
+    return [
+        label for pattern, label in mapping.items() if any(pattern in hit for hit in found)
+    ]
+
+
+# Single-pass scanners over set names, card names and oracle text
+_SET_FOIL_SCANNER = _compile_substring_scanner(_SPECIAL_FOIL_TREATMENTS)
+_SET_TREATMENT_SCANNER = _compile_substring_scanner(_SPECIAL_TREATMENTS)
+_ORACLE_MECHANIC_SCANNER = _compile_substring_scanner(_SPECIAL_MECHANICS)
+
+
+def extract_finish(card: Dict[str, Any], is_foil: bool) -> str:
+    """Extract finish information from MTG card data"""
+    return extract_metadata(card, is_foil)[0]
+
+
+def extract_features(card: Dict[str, Any]) -> List[str]:
+    """Extract special features/characteristics from MTG card data"""
+    return extract_metadata(card, False)[1]
+
+
+def extract_metadata(card: Dict[str, Any], is_foil: bool) -> Tuple[str, List[str]]:
+    """Extract (finish, features) from MTG card data in one pass over its fields"""
+    # Fields shared by the finish and feature rules
+    finishes = card.get("finishes", [])
+    frame_effects = card.get("frame_effects", [])
+    is_promo = card.get("promo")
+    promo_types = card.get("promo_types", []) if is_promo else []
+    border_color = card.get("border_color", "")
+    set_name = card.get("set_name", "").lower()
+    set_type = card.get("set_type", "")
+    collector_number = card.get("collector_number", "")
+    card_name_lower = card.get("name", "").lower()
+    variation = card.get("variation", False)
+    oversized = card.get("oversized", False)
+
+    # Fast path: most modern cards carry no treatment at all, and for them the
+    # finish is decided by foiling alone
+    if (
+        not frame_effects
+        and not promo_types
+        and not variation
+        and not oversized
+        and border_color not in _SPECIAL_BORDERS
+        and set_type not in _SPECIAL_SET_FINISHES
+        and "etched" not in finishes
+        and "textured" not in finishes
+        and not _SERIALIZED_RE.search(collector_number)
+        and "retro" not in card_name_lower
+        and "old border" not in card_name_lower
+        and not _SET_FOIL_SCANNER.search(set_name)
+        and not _SET_TREATMENT_SCANNER.search(set_name)
+        and not _SET_TREATMENT_SCANNER.search(card_name_lower)
+    ):
+        finish = "Foil" if is_foil or "foil" in finishes else "Non-Foil"
+    else:
+        # Build finish based on all factors. ``finish_parts`` keeps the
+        # order (for the single-part and fallback cases); ``flags`` mirrors it
+        # as a bitmask for the membership tests below.
+        finish_parts = []
+        flags = 0
+
+        # Special frame treatments (highest priority)
+        for effect in frame_effects:
+            if effect in _FRAME_TREATMENTS:
+                label = _FRAME_TREATMENTS[effect]
+                finish_parts.append(label)
+                flags |= _FINISH_BITS[label]
+                break  # Usually only one major treatment
+
+        # Check if this card has special foil treatment based on set
+        set_foils = _scan_in_order(_SET_FOIL_SCANNER, _SPECIAL_FOIL_TREATMENTS, set_name)
+        foil_treatment = set_foils[0] if set_foils else ""
+
+        # Special finishes from the finishes array
+        if "etched" in finishes and not flags & _FLAG_ETCHED:
+            finish_parts.append("Etched")
+            flags |= _FLAG_ETCHED
+
+        # Foil handling - now with special treatments
+        if is_foil or "foil" in finishes:
+            # Check for special foil types first
+            if foil_treatment:
+                # Some treatments are standalone
+                if foil_treatment in _STANDALONE_FOIL_TREATMENTS:
+                    finish_parts.append(foil_treatment)
+                    flags |= _FINISH_BITS[foil_treatment]
+                elif foil_treatment == "From the Vault":
+                    finish_parts.append("From the Vault Foil")
+                    flags |= _FINISH_BITS["From the Vault Foil"]
+                else:
+                    # Add treatment if not already present
+                    treatment_bit = _FINISH_BITS[foil_treatment]
+                    if not flags & treatment_bit:
+                        finish_parts.append(foil_treatment)
+                        flags |= treatment_bit
+                    finish_parts.append("Foil")
+                    flags |= _FLAG_FOIL
+
+            # Check for textured foil
+            elif "textured" in finishes or "textured" in " ".join(frame_effects):
+                finish_parts.append("Textured Foil")
+                flags |= _FLAG_TEXTURED_FOIL
+
+            # Check for etched foil combination
+            elif "etched" in finishes and "foil" in finishes:
+                # Etched was already recorded above, so only Foil is added
+                finish_parts.append("Foil")
+                flags |= _FLAG_FOIL
+
+            # Regular foil - but check for special foil types from promos
+            elif promo_types:
+                # Promo foils often have special designations
+                for promo in promo_types:
+                    if promo in _PROMO_FOIL_TYPES:
+                        label = _PROMO_FOIL_TYPES[promo]
+                        finish_parts.append(label)
+                        flags |= _FINISH_BITS[label]
+                        break
+                else:
+                    finish_parts.append("Foil")
+                    flags |= _FLAG_FOIL
+            else:
+                # Standard foil (no special treatment found)
+                finish_parts.append("Foil")
+                flags |= _FLAG_FOIL
+
+        # Special set types that affect finish
+        if set_type in _SPECIAL_SET_FINISHES:
+            label = _SPECIAL_SET_FINISHES[set_type]
+            if not flags & _FINISH_BITS[label]:
+                finish_parts.append(label)
+                flags |= _FINISH_BITS[label]
+
+        # Special printings and variants
+        if variation:
+            finish_parts.append("Variant")
+            flags |= _FINISH_BITS["Variant"]
+
+        if oversized:
+            finish_parts.append("Oversized")
+            flags |= _FINISH_BITS["Oversized"]
+
+        # Serialized cards (check collector number)
+        if _SERIALIZED_RE.search(collector_number):
+            finish_parts.append("Serialized")
+            flags |= _FLAG_SERIALIZED
+
+        # Special treatments from card name
+        if "retro" in card_name_lower or "old border" in card_name_lower:
+            finish_parts.append("Retro Frame")
+            flags |= _FINISH_BITS["Retro Frame"]
+
+        # Rarity-based special finishes
+        if (
+            card.get("rarity", "") == "mythic"
+            and is_foil
+            and set_type in _MYTHIC_FOIL_SET_TYPES
+            and "showcase" not in frame_effects
+            and "extendedart" not in frame_effects
+        ):
+            finish_parts.append("Mythic")
+            flags |= _FLAG_MYTHIC
+
+        # Special card treatments
+        for treatment in _scan_in_order(
+            _SET_TREATMENT_SCANNER, _SPECIAL_TREATMENTS, set_name, card_name_lower
+        ):
+            treatment_bit = _FINISH_BITS[treatment]
+            if not flags & treatment_bit:
+                finish_parts.append(treatment)
+                flags |= treatment_bit
+
+        # Border colors (special editions)
+        if border_color == "gold":
+            finish_parts.append("Gold Border")
+            flags |= _FINISH_BITS["Gold Border"]
+        elif border_color == "silver":
+            finish_parts.append("Silver Border")
+            flags |= _FINISH_BITS["Silver Border"]
+
+        finish = _resolve_finish(finish_parts, flags)
+
+    # Features
+    features = []
+
+    # Frame effects - these are characteristics, not set names
+    for effect in frame_effects:
+        if effect in _EFFECT_MAPPING:
+            features.append(_EFFECT_MAPPING[effect])
+
+    # Promo information
+    if is_promo:
+        for promo in promo_types:
+            if promo in _PROMO_MAPPING:
+                features.append(_PROMO_MAPPING[promo])
+
+        # If promo but no specific type
+        if not promo_types and "Promo" not in features:
+            features.append("Promo")
+
+    # REMOVED: Masterpiece series and special set names
+    # These belong in the Set field, not Features
+
+    # Only add set TYPE if it's a characteristic, not a set name
+    if set_type == "funny":
+        features.append("Un-set")
+
+    # Frame information
+    frame = card.get("frame", "")
+    if frame in _FRAME_FEATURES:
+        features.append(_FRAME_FEATURES[frame])
+
+    # Border type - these are characteristics
+    if border_color == "gold":
+        features.append("Gold Border")
+    elif border_color == "silver":
+        features.append("Silver Border")
+    elif border_color == "white":
+        features.append("White Border")
+
+    # Special printings
+    keywords = card.get("keywords", [])
+    for keyword in keywords:
+        keyword_lower = keyword.lower()
+        if keyword_lower in _SPECIAL_KEYWORDS:
+            features.append(_SPECIAL_KEYWORDS[keyword_lower])
+
+    # Card layout special types
+    layout = card.get("layout", "")
+    if layout in _LAYOUT_FEATURES:
+        features.append(_LAYOUT_FEATURES[layout])
+
+    # Oversized cards
+    if oversized:
+        features.append("Oversized")
+
+    # Reserved list
+    if card.get("reserved"):
+        features.append("Reserved List")
+
+    # Full art lands
+    if card.get("full_art"):
+        features.append("Full Art Land")
+
+    # Textless
+    if card.get("textless"):
+        features.append("Textless")
+
+    # Story spotlight
+    if card.get("story_spotlight"):
+        features.append("Story Spotlight")
+
+    # Special card variations
+    if variation:
+        features.append("Variant")
+
+    # Unique/Special printings
+    # Numbered cards (serialized)
+    if _NUMBERED_RE.search(collector_number):
+        features.append("Numbered")
+
+    # Special numbering schemes
+    if collector_number:
+        if collector_number.endswith("★"):
+            features.append("Star Number")
+        elif collector_number.endswith("†"):
+            features.append("Dagger Number")
+        elif _ALT_ART_RE.search(collector_number):
+            features.append("Alternate Art")
+        elif collector_number.startswith("F"):
+            features.append("Foil-Only")
+
+    # Special mechanics from oracle text
+    oracle_text = card.get("oracle_text", "").lower()
+
+    for feature in _scan_in_order(_ORACLE_MECHANIC_SCANNER, _SPECIAL_MECHANICS, oracle_text):
+        if feature not in features:
+            features.append(feature)
+
+    # Arena/Digital only
+    if card.get("digital"):
+        features.append("Digital Only")
+
+    games = card.get("games", [])
+    if len(games) == 1 and "arena" in games:
+        features.append("Arena Exclusive")
+
+    # Special artist variations
+    if "mox" in card_name_lower and "dan frazier" in card.get("artist", "").lower():
+        features.append("Original Art")
+
+    # Un-set specific
+    if set_type == "funny":
+        # Check for specific Un-set mechanics
+        security_stamp = card.get("security_stamp", "")
+        if "acorn" in security_stamp:
+            features.append("Acorn Card")
+        elif "oval" in security_stamp:
+            features.append("Eternal Legal")
+
+    # Remove duplicates while preserving order
+    return finish, list(dict.fromkeys(features))
+
+
+def _resolve_finish(finish_parts: List[str], flags: int) -> str:
+    """Combine accumulated finish parts into the single finish label"""
+    if not finish_parts:
+        # CHANGED: Always return a finish - default to Non-Foil for regular cards
+        return "Non-Foil"
+    if len(finish_parts) == 1:
+        return finish_parts[0]
+
+    # Serialized takes highest priority
+    if flags & _FLAG_SERIALIZED:
+        # Serialized + Double Rainbow (Brothers' War)
+        if flags & _FLAG_DOUBLE_RAINBOW:
+            return "Serialized Double Rainbow"
+        return "Serialized"
+
+    # Special foil treatments - these are complete treatments on their own
+    for bit, label in _SPECIAL_FOIL_BITS:
+        if flags & bit:
+            if bit == _FLAG_OIL_SLICK and flags & _FLAG_TEXTURED_FOIL:
+                return "Oil Slick Raised Foil"
+            return label
+
+    # Frame treatments with foil
+    combo = _FOIL_COMBO_DISPATCH.get(flags & _FOIL_COMBO_MASK)
+    if combo is not None:
+        return combo
+    if flags & _FLAG_TEXTURED_FOIL:
+        return "Textured Foil"
+
+    # Special sets/series, with foil designation if applicable
+    for bit, label in _SPECIAL_PRIORITY_BITS:
+        if flags & bit:
+            return f"{label} Foil" if flags & _FLAG_FOIL else label
+
+    # Return the most specific/important finish
+    for bit, label in _PRIORITY_ORDER_BITS:
+        if flags & bit:
+            return label
+
+    # Fallback to first finish
+    return finish_parts[0]
@@ -1,19 +1,51 @@
 """Async caching layer for all API responses with database synchronization"""
 
 import asyncio
-import hashlib
+import functools
+import os
+import queue
+import threading
+import weakref
 from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
-import aiofiles
 import diskcache
 
-from .cache import CacheManager
+from .cache import CacheManager, _cache_set
 from .database.service import DatabaseService
 from .models import ProcessingConfig
 
 
+def _drain_writes(write_queue: "queue.SimpleQueue") -> None:
+    """Apply queued cache writes until the stop sentinel arrives"""
+    # Module-level so the thread holds the queue, not the manager
+    while (item := write_queue.get()) is not None:
+        cache, key, value, ttl = item
+        try:
+            _cache_set(cache, key, value, ttl)
+        except Exception as e:
+            print(f"Background cache write failed: {e}")
+
+
+def _expire_loop(manager_ref: "weakref.ref", stop: threading.Event, interval: float) -> None:
+    """Periodically expire old entries, one cache at a time, until stopped"""
+    # Only a weak reference is kept between sweeps, so the manager can still be
+    # collected; a collected manager ends the loop
+    while not stop.wait(interval):
+        manager = manager_ref()
+        if manager is None:
+            return
+        manager._cleanup_old_cache_entries()
+        del manager
+
+
+def _stop_background(write_queue: "queue.SimpleQueue", stop: threading.Event) -> None:
+    """Signal both background threads to finish (used when a manager is collected)"""
+    stop.set()
+    write_queue.put(None)
+
+
 class AsyncCacheManager(CacheManager):
     """Async version of CacheManager with concurrent processing capabilities"""
 
@@ -22,125 +54,180 @@ class AsyncCacheManager(CacheManager):
         cache_dir: Path,
         config: ProcessingConfig,
         db_service: DatabaseService = None,
-        max_workers: int = 4,
+        max_workers: Optional[int] = None,
     ):
         super().__init__(cache_dir, config, db_service)
-        self.max_workers = max_workers
-        self._executor = ThreadPoolExecutor(max_workers=max_workers)
+        # Same default as ThreadPoolExecutor: enough threads to keep I/O queued
+        self.max_workers = max_workers or min(32, (os.cpu_count() or 1) * 4)
+
+        # path -> (size, mtime_ns, hash) so re-warming an unchanged directory skips hashing
+        self._path_to_hash: Dict[str, Tuple[int, int, str]] = {}
+
+        # Cache writes are queued and applied by a single background thread so
+        # callers never wait on SQLite; None tells the writer to stop
+        self._write_queue = queue.SimpleQueue()
+        self._writer = threading.Thread(
+            target=_drain_writes, args=(self._write_queue,), daemon=True
+        )
+        self._writer.start()
+
+        # Expired entries are swept by a background timer instead of during sync
+        self._stop_expiry = threading.Event()
+        self._expirer = threading.Thread(
+            target=_expire_loop,
+            args=(weakref.ref(self), self._stop_expiry, max(60, self.config.cache_ttl * 3600)),
+            daemon=True,
+        )
+        self._expirer.start()
+
+        # Neither thread references the manager, so it can be collected; if it
+        # is, tell them to finish. close_all() is still the way to flush writes.
+        self._finalizer = weakref.finalize(
+            self, _stop_background, self._write_queue, self._stop_expiry
+        )
+
+    @functools.cached_property
+    def _executor(self) -> ThreadPoolExecutor:
+        """Worker pool for blocking cache calls, created on first use"""
+        return ThreadPoolExecutor(max_workers=self.max_workers)
+
+    def _run(self, fn, *args) -> "asyncio.Future":
+        """Run a blocking call on this manager's executor"""
+        return asyncio.get_running_loop().run_in_executor(self._executor, fn, *args)
 
     async def get_image_hash_async(self, image_path: str) -> str:
         """Generate unique hash for image asynchronously"""
-        hasher = hashlib.sha256()
+        if not self.config.strict_hash:
+            # Metadata-only hashing is a single stat call, no need to leave the loop
+            return self.get_image_hash(image_path)
 
-        try:
-            # Get file stats asynchronously
-            loop = asyncio.get_event_loop()
-            stat = await loop.run_in_executor(None, Path(image_path).stat)
-            hasher.update(f"{stat.st_size}_{stat.st_mtime}".encode())
-
-            # Read file in chunks asynchronously
-            async with aiofiles.open(image_path, "rb") as f:
-                # Read first 32KB for hash
-                chunk = await f.read(32768)
-                hasher.update(chunk)
-
-            return hasher.hexdigest()
-        except Exception:
-            return hashlib.sha256(image_path.encode()).hexdigest()
+        # Stream the whole file on a worker thread; hasher.update releases the GIL
+        return await self._run(self.get_image_hash, image_path)
 
     async def get_batch_image_hashes(self, image_paths: List[str]) -> Dict[str, str]:
         """Generate hashes for multiple images concurrently"""
-        tasks = [self.get_image_hash_async(path) for path in image_paths]
-        hashes = await asyncio.gather(*tasks, return_exceptions=True)
-
-        result = {}
-        for path, hash_val in zip(image_paths, hashes):
-            if isinstance(hash_val, Exception):
-                # Fallback hash on error
-                result[path] = hashlib.sha256(path.encode()).hexdigest()
-            else:
-                result[path] = hash_val
-
-        return result
+        return await self.get_batch_image_hashes_async(image_paths)
 
     async def get_cached_identification_async(self, image_hash: str) -> Optional[Dict[str, Any]]:
         """Get cached card identification asynchronously"""
-        loop = asyncio.get_event_loop()
-        return await loop.run_in_executor(
-            self._executor, self.image_cache.get, f"ximilar_{image_hash}"
-        )
+        data = self._mem_get(self._id_mem, f"ximilar_{image_hash}")
+        if data is not None:
+            return data
+        return await self._run(self.get_cached_identification, image_hash)
 
     async def cache_identification_async(self, image_hash: str, data: Dict[str, Any]):
         """Cache card identification asynchronously"""
-        loop = asyncio.get_event_loop()
-        ttl = self.config.cache_ttl * 24 * 60 * 60
-        await loop.run_in_executor(
-            self._executor, self.image_cache.set, f"ximilar_{image_hash}", data, ttl
-        )
+        key = f"ximilar_{image_hash}"
+        self._mem_put(self._id_mem, key, data, self.ID_MEMORY_SIZE)
+        self._write_queue.put((self.image_cache, key, data, self._ttl_seconds))
 
     async def get_batch_cached_identifications(
         self, image_hashes: List[str]
     ) -> Dict[str, Optional[Dict[str, Any]]]:
-        """Get multiple cached identifications concurrently"""
-        tasks = [self.get_cached_identification_async(hash_val) for hash_val in image_hashes]
-        results = await asyncio.gather(*tasks, return_exceptions=True)
+        """Get multiple cached identifications, reading memory misses in one executor call"""
+        result = {
+            hash_val: self._mem_get(self._id_mem, f"ximilar_{hash_val}")
+            for hash_val in image_hashes
+        }
+        misses = [hash_val for hash_val, data in result.items() if data is None]
+        if not misses:
+            return result
 
-        return {
-            hash_val: (None if isinstance(result, Exception) else result)
-            for hash_val, result in zip(image_hashes, results)
+        keys = [f"ximilar_{hash_val}" for hash_val in misses]
+        try:
+            values = await self._run(self._get_many, self.image_cache, keys)
+        except Exception:
+            return result
+
+        for hash_val, key, data in zip(misses, keys, values):
+            if data is not None:
+                self._mem_put(self._id_mem, key, data, self.ID_MEMORY_SIZE)
+            result[hash_val] = data
+        return result
+
+    async def has_cached_identifications(self, image_hashes: List[str]) -> Dict[str, bool]:
+        """Report which hashes have a cached identification without loading the blobs"""
+        result = {
+            hash_val: self._mem_get(self._id_mem, f"ximilar_{hash_val}") is not None
+            for hash_val in image_hashes
         }
+        misses = [hash_val for hash_val, present in result.items() if not present]
+        if not misses:
+            return result
+
+        keys = [f"ximilar_{hash_val}" for hash_val in misses]
+        try:
+            present = await self._run(self._has_many, self.image_cache, keys)
+        except Exception:
+            return result
+
+        result.update(zip(misses, present))
+        return result
 
     async def get_cached_card_data_async(
         self, card_name: str, set_name: str
     ) -> Optional[Dict[str, Any]]:
         """Get cached card pricing/metadata asynchronously"""
-        key = self.get_card_data_key(card_name, set_name)
-        loop = asyncio.get_event_loop()
-        return await loop.run_in_executor(self._executor, self.card_data_cache.get, key)
+        data = self._mem_get(self._card_mem, self.get_card_data_key(card_name, set_name))
+        if data is not None:
+            return data
+        return await self._run(self.get_cached_card_data, card_name, set_name)
 
     async def cache_card_data_async(self, card_name: str, set_name: str, data: Dict[str, Any]):
         """Cache card pricing/metadata asynchronously"""
         key = self.get_card_data_key(card_name, set_name)
-        ttl = self.config.cache_ttl * 24 * 60 * 60
-        loop = asyncio.get_event_loop()
-        await loop.run_in_executor(self._executor, self.card_data_cache.set, key, data, ttl)
+        self._mem_put(self._card_mem, key, data, self.CARD_MEMORY_SIZE)
+        self._write_queue.put((self.card_data_cache, key, data, self._ttl_seconds))
 
     async def get_cached_ebay_url_async(self, image_hash: str) -> Optional[str]:
         """Get cached eBay EPS URL asynchronously"""
-        loop = asyncio.get_event_loop()
-        return await loop.run_in_executor(
-            self._executor, self.ebay_cache.get, f"ebay_eps_{image_hash}"
-        )
+        return await self._run(self.ebay_cache.get, f"ebay_eps_{image_hash}")
 
     async def cache_ebay_url_async(self, image_hash: str, url: str):
         """Cache eBay EPS URL asynchronously"""
-        ttl = self.config.cache_ttl * 24 * 60 * 60
-        loop = asyncio.get_event_loop()
-        await loop.run_in_executor(
-            self._executor, self.ebay_cache.set, f"ebay_eps_{image_hash}", url, ttl
-        )
+        self._write_queue.put((self.ebay_cache, f"ebay_eps_{image_hash}", url, self._ttl_seconds))
 
     async def get_batch_cached_ebay_urls(self, image_hashes: List[str]) -> Dict[str, Optional[str]]:
-        """Get multiple cached eBay URLs concurrently"""
-        tasks = [self.get_cached_ebay_url_async(hash_val) for hash_val in image_hashes]
-        results = await asyncio.gather(*tasks, return_exceptions=True)
+        """Get multiple cached eBay URLs in one executor call"""
+        keys = [f"ebay_eps_{hash_val}" for hash_val in image_hashes]
+        try:
+            results = await self._run(self._get_many, self.ebay_cache, keys)
+        except Exception:
+            return dict.fromkeys(image_hashes)
 
-        return {
-            hash_val: (None if isinstance(result, Exception) else result)
-            for hash_val, result in zip(image_hashes, results)
-        }
+        return dict(zip(image_hashes, results))
 
     async def warm_cache_for_images(self, image_paths: List[str]):
         """Pre-compute and cache hashes for a batch of images"""
-        # Generate all hashes concurrently
-        hashes = await self.get_batch_image_hashes(image_paths)
-
-        # Check which ones are already cached
-        cached_data = await self.get_batch_cached_identifications(list(hashes.values()))
-
-        uncached_paths = [
-            path for path, hash_val in hashes.items() if cached_data.get(hash_val) is None
-        ]
+        # Reuse hashes of files that haven't changed since the last pass
+        known: Dict[str, str] = {}
+        stats: Dict[str, os.stat_result] = {}
+        for path in image_paths:
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            stats[path] = stat
+            entry = self._path_to_hash.get(path)
+            if entry and entry[0] == stat.st_size and entry[1] == stat.st_mtime_ns:
+                known[path] = entry[2]
+
+        # Generate the remaining hashes concurrently
+        unknown = [path for path in image_paths if path not in known]
+        if unknown:
+            fresh = await self.get_batch_image_hashes(unknown)
+            for path, hash_val in fresh.items():
+                stat = stats.get(path)
+                if stat is not None:
+                    self._path_to_hash[path] = (stat.st_size, stat.st_mtime_ns, hash_val)
+            known.update(fresh)
+
+        hashes = {path: known[path] for path in image_paths}
+
+        # Check which ones are already cached; only presence matters here
+        cached = await self.has_cached_identifications(list(hashes.values()))
+
+        uncached_paths = [path for path, hash_val in hashes.items() if not cached.get(hash_val)]
 
         if uncached_paths:
             print(f"Found {len(uncached_paths)} images without cached identifications")
@@ -149,13 +236,9 @@ class AsyncCacheManager(CacheManager):
 
     async def sync_with_database_async(self):
         """Asynchronously synchronize cache with database for consistency"""
-        loop = asyncio.get_event_loop()
-
         try:
             # Get database statistics in thread pool
-            db_stats = await loop.run_in_executor(
-                self._executor, self.db_service.get_database_stats
-            )
+            db_stats = await self._run(self.db_service.get_database_stats)
 
             # Log synchronization status
             if db_stats:
@@ -163,34 +246,33 @@ class AsyncCacheManager(CacheManager):
                     f"Database sync: {db_stats['total_cards']} cards, {db_stats['total_price_snapshots']} price snapshots"
                 )
 
-            # Clear old cache entries periodically
-            await self._cleanup_old_cache_entries_async()
-
         except Exception as e:
             print(f"Cache-database sync failed: {e}")
 
     async def _cleanup_old_cache_entries_async(self):
         """Clean up old cache entries asynchronously"""
-        loop = asyncio.get_event_loop()
+        # Expire sequentially; parallel sweeps only contend on the write locks
+        await self._run(self._cleanup_old_cache_entries)
+
+    def close_all(self):
+        """Stop background work, flush pending writes, then close all cache connections"""
+        # Only shut the pool down if it was ever created; waiting lets running
+        # calls queue their last writes
+        if "_executor" in self.__dict__:
+            self._executor.shutdown(wait=True)
+            del self.__dict__["_executor"]
+        self._finalizer.detach()
+        self._stop_expiry.set()
+        if self._expirer.is_alive():
+            self._expirer.join()
+        # The writer drains everything queued before the sentinel
+        if self._writer.is_alive():
+            self._write_queue.put(None)
+            self._writer.join()
+        super().close_all()
 
-        try:
-            # Clear entries older than TTL in thread pool
-            tasks = [
-                loop.run_in_executor(self._executor, cache.expire)
-                for cache in [
-                    self.image_cache,
-                    self.card_data_cache,
-                    self.ebay_cache,
-                    self.title_cache,
-                    self.pricing_cache,
-                ]
-            ]
-            await asyncio.gather(*tasks, return_exceptions=True)
-        except Exception as e:
-            print(f"Cache cleanup failed: {e}")
+    def __enter__(self) -> "AsyncCacheManager":
+        return self
 
-    def __del__(self):
-        """Cleanup resources"""
-        if hasattr(self, "_executor"):
-            self._executor.shutdown(wait=False)
-        super().close_all()
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close_all()
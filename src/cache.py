@@ -1,11 +1,56 @@
 """Caching layer for all API responses with database synchronization"""
 
+import asyncio
+import functools
 import hashlib
+import os
+import re
+import threading
+import time
+from collections import OrderedDict
 from pathlib import Path
 from typing import Any, Dict, List, Optional
 
 import diskcache
 
+# Image hashes are only cache keys, so use a fast non-cryptographic hash.
+# The version prefix keeps keys from different hash functions (including the
+# old unprefixed SHA-256 keys) from ever colliding.
+try:
+    import xxhash
+
+    HASH_VERSION = "xxh3"
+    new_image_hasher = xxhash.xxh3_128
+except ImportError:
+    HASH_VERSION = "b2b"
+    new_image_hasher = functools.partial(hashlib.blake2b, digest_size=16)
+
+
+def hash_key(data: bytes) -> str:
+    """Versioned hex digest of data, used for image cache keys"""
+    return f"{HASH_VERSION}_{new_image_hasher(data).hexdigest()}"
+
+
+_KEY_CLEAN_RE = re.compile(r"[^\w\s]")
+
+
+@functools.lru_cache(maxsize=8192)
+def _card_data_key(card_name: str, set_name: str) -> str:
+    """Normalized card data cache key; names and sets repeat heavily across a batch"""
+    name = _KEY_CLEAN_RE.sub("", card_name.lower()).strip()
+    set_key = _KEY_CLEAN_RE.sub("", set_name.lower()).strip()
+    return f"{name}|{set_key}"
+
+
+def _cache_set(cache, key: str, value: Any, expire: float) -> bool:
+    """Write to a disk cache, reporting writes dropped on lock contention"""
+    # FanoutCache turns a lock timeout into a False return instead of raising
+    stored = cache.set(key, value, expire=expire)
+    if not stored:
+        print(f"Cache write dropped after lock timeout: {key}")
+    return stored
+
+
 # Flexible imports that work both as package and direct execution
 try:
     from .database.service import DatabaseService
@@ -25,77 +70,160 @@ except ImportError:
 
 
 class CacheManager:
+    # Entries kept in the in-memory LRUs in front of image_cache / card_data_cache
+    ID_MEMORY_SIZE = 2048
+    CARD_MEMORY_SIZE = 4096
+    # Seconds a shard waits for its SQLite lock before a read misses or a write
+    # is dropped
+    DISK_TIMEOUT = 10
+
     def __init__(
         self, cache_dir: Path, config: ProcessingConfig, db_service: DatabaseService = None
     ):
         self.config = config
         self.db_service = db_service or DatabaseService()
+        self._ttl_seconds = config.cache_ttl * 24 * 60 * 60
         cache_size = config.cache_size_gb * 1024**3 // 4
-
-        # Initialize individual caches
-        self.image_cache = diskcache.Cache(
-            cache_dir / "images", size_limit=cache_size, eviction_policy="least-recently-used"
+        shards = config.cache_shards
+
+        # Hot keys are served from memory so repeat lookups skip SQLite.
+        # Values are (monotonic expiry, data); the lock covers both LRUs.
+        self._id_mem: "OrderedDict[str, tuple]" = OrderedDict()
+        self._card_mem: "OrderedDict[str, tuple]" = OrderedDict()
+        self._mem_lock = threading.Lock()
+
+        # Initialize individual caches, each sharded over several SQLite files so
+        # concurrent writers don't all queue on one database lock
+        self.image_cache = diskcache.FanoutCache(
+            cache_dir / "images",
+            shards=shards,
+            timeout=self.DISK_TIMEOUT,
+            size_limit=cache_size,
+            eviction_policy="least-recently-used",
         )
 
-        self.card_data_cache = diskcache.Cache(
-            cache_dir / "card_data", size_limit=cache_size, eviction_policy="least-recently-used"
+        self.card_data_cache = diskcache.FanoutCache(
+            cache_dir / "card_data",
+            shards=shards,
+            timeout=self.DISK_TIMEOUT,
+            size_limit=cache_size,
+            eviction_policy="least-recently-used",
         )
 
-        self.ebay_cache = diskcache.Cache(
-            cache_dir / "ebay_eps", size_limit=cache_size, eviction_policy="least-recently-used"
+        self.ebay_cache = diskcache.FanoutCache(
+            cache_dir / "ebay_eps",
+            shards=shards,
+            timeout=self.DISK_TIMEOUT,
+            size_limit=cache_size,
+            eviction_policy="least-recently-used",
         )
 
-        self.title_cache = diskcache.Cache(
-            cache_dir / "titles", size_limit=cache_size, eviction_policy="least-recently-used"
+        self.title_cache = diskcache.FanoutCache(
+            cache_dir / "titles",
+            shards=shards,
+            timeout=self.DISK_TIMEOUT,
+            size_limit=cache_size,
+            eviction_policy="least-recently-used",
         )
 
-        self.pricing_cache = diskcache.Cache(
-            cache_dir / "pricing", size_limit=cache_size, eviction_policy="least-recently-used"
+        self.pricing_cache = diskcache.FanoutCache(
+            cache_dir / "pricing",
+            shards=shards,
+            timeout=self.DISK_TIMEOUT,
+            size_limit=cache_size,
+            eviction_policy="least-recently-used",
         )
 
     def get_image_hash(self, image_path: str) -> str:
-        """Generate unique hash for image"""
-        hasher = hashlib.sha256()
+        """Generate unique hash for image.
 
+        By default the key is derived from size, mtime and inode alone, which is
+        enough for scans that are never rewritten in place. Set
+        ``strict_hash`` to hash the full file contents instead.
+        """
         try:
-            stat = Path(image_path).stat()
-            hasher.update(f"{stat.st_size}_{stat.st_mtime}".encode())
+            if self.config.strict_hash:
+                return self._hash_file_streaming(image_path)
 
-            with open(image_path, "rb") as f:
-                chunk = f.read(32768)
+            stat = os.stat(image_path)
+            return hash_key(f"{stat.st_size}_{stat.st_mtime_ns}_{stat.st_ino}".encode())
+        except Exception:
+            return hash_key(image_path.encode())
+
+    def _hash_file_streaming(self, image_path: str, chunk_size: int = 1 << 20) -> str:
+        """Hash the whole file in fixed-size chunks so the key depends only on content"""
+        hasher = new_image_hasher()
+        with open(image_path, "rb") as f:
+            while chunk := f.read(chunk_size):
                 hasher.update(chunk)
+        return f"{HASH_VERSION}_{hasher.hexdigest()}"
 
-            return hasher.hexdigest()
-        except Exception:
-            return hashlib.sha256(image_path.encode()).hexdigest()
+    @staticmethod
+    def _get_many(cache, keys: List[str]) -> List[Any]:
+        """Read several keys from one cache in a single call"""
+        return [cache.get(key) for key in keys]
+
+    @staticmethod
+    def _has_many(cache, keys: List[str]) -> List[bool]:
+        """Check which keys are present without unpickling their values"""
+        return [key in cache for key in keys]
 
     def get_card_data_key(self, card_name: str, set_name: str) -> str:
         """Generate cache key for card data"""
-        import re
-
-        normalized_name = re.sub(r"[^\w\s]", "", card_name.lower()).strip()
-        normalized_set = re.sub(r"[^\w\s]", "", set_name.lower()).strip()
-        return f"{normalized_name}|{normalized_set}"
+        return _card_data_key(card_name, set_name)
+
+    def _mem_get(self, mem: OrderedDict, key: str) -> Optional[Dict[str, Any]]:
+        """Return a live entry from an in-memory LRU, dropping it if expired"""
+        with self._mem_lock:
+            entry = mem.get(key)
+            if entry is None:
+                return None
+            expires_at, data = entry
+            if expires_at <= time.monotonic():
+                del mem[key]
+                return None
+            mem.move_to_end(key)
+        return dict(data)
+
+    def _mem_put(self, mem: OrderedDict, key: str, data: Dict[str, Any], maxsize: int):
+        """Insert into an in-memory LRU, evicting the oldest entries when full"""
+        with self._mem_lock:
+            mem[key] = (time.monotonic() + self._ttl_seconds, dict(data))
+            mem.move_to_end(key)
+            while len(mem) > maxsize:
+                mem.popitem(last=False)
 
     def get_cached_identification(self, image_hash: str) -> Optional[Dict[str, Any]]:
         """Get cached card identification"""
-        return self.image_cache.get(f"ximilar_{image_hash}")
+        key = f"ximilar_{image_hash}"
+        data = self._mem_get(self._id_mem, key)
+        if data is None:
+            data = self.image_cache.get(key)
+            if data is not None:
+                self._mem_put(self._id_mem, key, data, self.ID_MEMORY_SIZE)
+        return data
 
     def cache_identification(self, image_hash: str, data: Dict[str, Any]):
         """Cache card identification"""
-        ttl = self.config.cache_ttl * 24 * 60 * 60
-        self.image_cache.set(f"ximilar_{image_hash}", data, expire=ttl)
+        key = f"ximilar_{image_hash}"
+        self._mem_put(self._id_mem, key, data, self.ID_MEMORY_SIZE)
+        _cache_set(self.image_cache, key, data, self._ttl_seconds)
 
     def get_cached_card_data(self, card_name: str, set_name: str) -> Optional[Dict[str, Any]]:
         """Get cached card pricing/metadata"""
         key = self.get_card_data_key(card_name, set_name)
-        return self.card_data_cache.get(key)
+        data = self._mem_get(self._card_mem, key)
+        if data is None:
+            data = self.card_data_cache.get(key)
+            if data is not None:
+                self._mem_put(self._card_mem, key, data, self.CARD_MEMORY_SIZE)
+        return data
 
     def cache_card_data(self, card_name: str, set_name: str, data: Dict[str, Any]):
         """Cache card pricing/metadata"""
         key = self.get_card_data_key(card_name, set_name)
-        ttl = self.config.cache_ttl * 24 * 60 * 60
-        self.card_data_cache.set(key, data, expire=ttl)
+        self._mem_put(self._card_mem, key, data, self.CARD_MEMORY_SIZE)
+        _cache_set(self.card_data_cache, key, data, self._ttl_seconds)
 
     def get_cached_ebay_url(self, image_hash: str) -> Optional[str]:
         """Get cached eBay EPS URL"""
@@ -103,8 +231,7 @@ class CacheManager:
 
     def cache_ebay_url(self, image_hash: str, url: str):
         """Cache eBay EPS URL"""
-        ttl = self.config.cache_ttl * 24 * 60 * 60
-        self.ebay_cache.set(f"ebay_eps_{image_hash}", url, expire=ttl)
+        _cache_set(self.ebay_cache, f"ebay_eps_{image_hash}", url, self._ttl_seconds)
 
     def get_cached_pricing(self, cache_key: str) -> Optional[Dict[str, Any]]:
         """Get cached pricing data with database fallback"""
@@ -120,8 +247,7 @@ class CacheManager:
 
     def cache_pricing(self, cache_key: str, data: Dict[str, Any]):
         """Cache pricing data"""
-        ttl = self.config.cache_ttl * 24 * 60 * 60
-        self.pricing_cache.set(f"pricing_{cache_key}", data, expire=ttl)
+        _cache_set(self.pricing_cache, f"pricing_{cache_key}", data, self._ttl_seconds)
 
         # Also sync to database if we have card information
         if data.get("database_card_id"):
@@ -174,38 +300,12 @@ class CacheManager:
     # Async methods for enhanced performance
     async def get_image_hash_async(self, image_path: str) -> str:
         """Async version of get_image_hash for better performance"""
-        try:
-            from .async_cache import AsyncCacheManager
-        except ImportError:
-            from src.async_cache import AsyncCacheManager
-
-        # Create async cache instance with same config
-        async_cache = AsyncCacheManager(
-            self.image_cache.directory.parent, self.config, self.db_service
-        )
-
-        try:
-            return await async_cache.get_image_hash_async(image_path)
-        finally:
-            # Cleanup executor
-            if hasattr(async_cache, "_executor"):
-                async_cache._executor.shutdown(wait=False)
+        if not self.config.strict_hash:
+            return self.get_image_hash(image_path)
+        return await asyncio.to_thread(self.get_image_hash, image_path)
 
     async def get_batch_image_hashes_async(self, image_paths: List[str]) -> Dict[str, str]:
         """Get hashes for multiple images concurrently"""
-        try:
-            from .async_cache import AsyncCacheManager
-        except ImportError:
-            from src.async_cache import AsyncCacheManager
-
-        # Create async cache instance
-        async_cache = AsyncCacheManager(
-            self.image_cache.directory.parent, self.config, self.db_service
-        )
-
-        try:
-            return await async_cache.get_batch_image_hashes(image_paths)
-        finally:
-            # Cleanup executor
-            if hasattr(async_cache, "_executor"):
-                async_cache._executor.shutdown(wait=False)
+        # get_image_hash never raises; it falls back to hashing the path itself
+        hashes = await asyncio.gather(*(self.get_image_hash_async(path) for path in image_paths))
+        return dict(zip(image_paths, hashes))
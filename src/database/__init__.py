@@ -1,34 +1,53 @@
 """Database module for Pokemon card reference and price tracking"""
 
-from .crud import (
-    CardCRUD,
-    CardSearchFilters,
-    PriceCRUD,
-    SetCRUD,
-    ValidationCRUD,
-    get_or_create_card,
-    get_or_create_set,
-    persist_api_card_data,
-)
-from .models import (
-    Base,
-    CardVariation,
-    PokemonCard,
-    PokemonSet,
-    PriceSnapshot,
-    Subtype,
-    Type,
-    ValidationRule,
-    XimilarCorrection,
-    get_session,
-    init_database,
-)
+import importlib
+
+# Exported names and the submodule that defines them. Submodules are imported
+# on first access so code that only needs e.g. database.optimized_service
+# doesn't pull in SQLAlchemy's models and CRUD layer.
+_LAZY = {
+    # Models
+    "PokemonCard": ".models",
+    "Card": ".models",
+    "PokemonSet": ".models",
+    "Type": ".models",
+    "Subtype": ".models",
+    "CardVariation": ".models",
+    "PriceSnapshot": ".models",
+    "ValidationRule": ".models",
+    "XimilarCorrection": ".models",
+    "Base": ".models",
+    "init_database": ".models",
+    "get_session": ".models",
+    # Service
+    "DatabaseService": ".service",
+    "get_db_service": ".service",
+    # CRUD
+    "CardCRUD": ".crud",
+    "SetCRUD": ".crud",
+    "PriceCRUD": ".crud",
+    "ValidationCRUD": ".crud",
+    "CardSearchFilters": ".crud",
+    "get_or_create_card": ".crud",
+    "get_or_create_set": ".crud",
+    "persist_api_card_data": ".crud",
+    "persist_api_card_data_bulk": ".crud",
+}
 
-# Backward compatibility alias
-Card = PokemonCard
-from .service import DatabaseService, get_db_service
 
-__all__ = [
+def __getattr__(name):
+    if name not in _LAZY:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(_LAZY[name], __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
+
+
+__all__ = (
     # Models
     "PokemonCard",
     "Card",  # Backward compatibility alias
@@ -54,4 +73,5 @@ __all__ = [
     "get_or_create_card",
     "get_or_create_set",
     "persist_api_card_data",
-]
+    "persist_api_card_data_bulk",
+)
@@ -1,11 +1,25 @@
 """Comprehensive CRUD operations for Pokemon TCG database"""
 
+import functools
 import uuid
 from dataclasses import dataclass
 from datetime import datetime, timedelta
-from typing import Any, Dict, List, Optional, Tuple, Union
-
-from sqlalchemy import and_, delete, func, or_, select, text, update
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple, Union
+
+from sqlalchemy import (
+    Integer,
+    Select,
+    and_,
+    bindparam,
+    delete,
+    func,
+    insert,
+    or_,
+    select,
+    text,
+    update,
+)
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.exc import IntegrityError, SQLAlchemyError
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session, joinedload, selectinload
@@ -43,6 +57,157 @@ class CardSearchFilters:
     offset: int = 0
 
 
+# Relationships loaded by the full card getters: the set (to-one) joins into
+# the card query, collections each take one extra SELECT ... IN query
+_CARD_DETAIL_OPTIONS = (
+    joinedload(PokemonCard.set),
+    selectinload(PokemonCard.types),
+    selectinload(PokemonCard.subtypes),
+    selectinload(PokemonCard.variations),
+    selectinload(PokemonCard.prices),
+)
+
+
+# Keys _card_row needs; everything else is optional
+_CARD_REQUIRED_FIELDS = frozenset({"api_id", "name", "number", "set_id"})
+
+
+def _card_row(card_data: Dict[str, Any]) -> Dict[str, Any]:
+    """PokemonCard column values from normalized card data"""
+    return {
+        "api_id": card_data["api_id"],
+        "name": card_data["name"],
+        "number": card_data["number"],
+        "set_id": card_data["set_id"],
+        "supertype": card_data.get("supertype"),
+        "rarity": card_data.get("rarity"),
+        "hp": card_data.get("hp"),
+        "evolves_from": card_data.get("evolves_from"),
+        "evolves_to": card_data.get("evolves_to", []),
+        "abilities": card_data.get("abilities", []),
+        "attacks": card_data.get("attacks", []),
+        "weaknesses": card_data.get("weaknesses", []),
+        "resistances": card_data.get("resistances", []),
+        "retreat_cost": card_data.get("retreat_cost", []),
+        "rules": card_data.get("rules", []),
+        "images": card_data.get("images", {}),
+        "tcgplayer_id": card_data.get("tcgplayer_id"),
+        "cardmarket_id": card_data.get("cardmarket_id"),
+        "artist": card_data.get("artist"),
+        "regulation_mark": card_data.get("regulation_mark"),
+    }
+
+
+# Parsed UUIDs for repeated string ids
+_parse_uuid = functools.lru_cache(maxsize=1024)(uuid.UUID)
+
+
+def _coerce_uuid(value: Union[str, uuid.UUID]) -> uuid.UUID:
+    """Card id as a UUID, parsing strings"""
+    return _parse_uuid(value) if type(value) is str else value
+
+
+def _like_pattern(term: str) -> str:
+    """ILIKE pattern for a search term"""
+    # A term that already ends in '%' asks for a prefix match; keeping it
+    # anchored lets the trigram indexes skip far more rows
+    return term if term.endswith("%") else f"%{term}%"
+
+
+# Priority order for the TCGplayer price category stored as a card's market price
+_PRICE_CATEGORIES = ("normal", "holofoil", "reverseHolofoil", "1stEdition", "unlimited")
+
+
+def _set_row(set_data: Dict[str, Any]) -> Dict[str, Any]:
+    """PokemonSet column values from normalized set data"""
+    # Parse release date if it's a string
+    release_date = set_data.get("release_date")
+    if isinstance(release_date, str):
+        release_date = datetime.fromisoformat(release_date.replace("Z", "+00:00")).date()
+
+    return {
+        "id": set_data["id"],
+        "name": set_data["name"],
+        "series": set_data.get("series"),
+        "printed_total": set_data.get("printed_total"),
+        "total": set_data.get("total"),
+        "legalities": set_data.get("legalities", {}),
+        "images": set_data.get("images", {}),
+        "ptcgo_code": set_data.get("ptcgo_code"),
+        "release_date": release_date,
+    }
+
+
+def _price_row(card_id: uuid.UUID, price_data: Dict[str, Any]) -> Dict[str, Any]:
+    """PriceSnapshot column values for a card"""
+    row = {
+        "card_id": card_id,
+        "variation_id": price_data.get("variation_id"),
+        "prices": price_data.get("prices", {}),
+        "source": price_data.get("source", "unknown"),
+        "condition": price_data.get("condition", "NM"),
+        "currency": price_data.get("currency", "USD"),
+        "volume": price_data.get("volume"),
+        "listings_count": price_data.get("listings_count"),
+    }
+    # Without an explicit timestamp the database stamps the row (UTC)
+    if price_data.get("timestamp") is not None:
+        row["timestamp"] = price_data["timestamp"]
+    return row
+
+
+# CardSearchFilters fields that search_cards filters on, with the condition each
+# adds; the filter value is bound to a parameter named after the field
+_CARD_SEARCH_CONDITIONS = {
+    "name": lambda: PokemonCard.name.ilike(bindparam("name")),
+    "set_name": lambda: PokemonSet.name.ilike(bindparam("set_name")),
+    "set_id": lambda: PokemonCard.set_id == bindparam("set_id"),
+    "supertype": lambda: PokemonCard.supertype == bindparam("supertype"),
+    "rarity": lambda: PokemonCard.rarity == bindparam("rarity"),
+    "hp_min": lambda: PokemonCard.hp >= bindparam("hp_min"),
+    "hp_max": lambda: PokemonCard.hp <= bindparam("hp_max"),
+    "artist": lambda: PokemonCard.artist.ilike(bindparam("artist")),
+    "number": lambda: PokemonCard.number == bindparam("number"),
+}
+_CARD_SEARCH_LIKE_FIELDS = frozenset({"name", "set_name", "artist"})
+
+
+@functools.lru_cache(maxsize=64)
+def _card_search_statement(fields: Tuple[str, ...]) -> Select:
+    """search_cards statement for a combination of filter fields"""
+    query = select(PokemonCard).options(
+        selectinload(PokemonCard.set),
+        selectinload(PokemonCard.types),
+        selectinload(PokemonCard.subtypes),
+    )
+    if "set_name" in fields:
+        query = query.join(PokemonSet)
+    if fields:
+        query = query.where(and_(*(_CARD_SEARCH_CONDITIONS[field]() for field in fields)))
+
+    # Apply pagination
+    return query.offset(bindparam("offset", type_=Integer)).limit(
+        bindparam("limit", type_=Integer)
+    )
+
+
+def _card_search(filters: CardSearchFilters) -> Tuple[Select, Dict[str, Any]]:
+    """Cached search statement and bind parameters for a set of filters"""
+    # Only the filters in use shape the statement; their values are bound
+    # at execute time, so each shape is built once and reused
+    fields = tuple(field for field in _CARD_SEARCH_CONDITIONS if getattr(filters, field))
+    params = {
+        field: (
+            _like_pattern(getattr(filters, field))
+            if field in _CARD_SEARCH_LIKE_FIELDS
+            else getattr(filters, field)
+        )
+        for field in fields
+    }
+    params.update(offset=filters.offset, limit=filters.limit)
+    return _card_search_statement(fields), params
+
+
 class CardCRUD:
     """CRUD operations for Pokemon cards"""
 
@@ -51,55 +216,35 @@ class CardCRUD:
         """Create a new Pokemon card"""
         try:
             # Validate required fields
-            required_fields = ["api_id", "name", "number", "set_id"]
-            for field in required_fields:
-                if field not in card_data:
-                    raise ValueError(f"Missing required field: {field}")
+            missing = _CARD_REQUIRED_FIELDS - card_data.keys()
+            if missing:
+                raise ValueError(f"Missing required field: {', '.join(sorted(missing))}")
 
             # Check if card already exists
-            existing_card = await CardCRUD.get_card_by_api_id(session, card_data["api_id"])
+            existing_card = await CardCRUD.get_card_by_api_id_shallow(
+                session, card_data["api_id"]
+            )
             if existing_card:
-                logger.warning(f"Card with API ID {card_data['api_id']} already exists")
+                logger.warning("Card with API ID %s already exists", card_data['api_id'])
                 return existing_card
 
             # Create the card
-            card = PokemonCard(
-                api_id=card_data["api_id"],
-                name=card_data["name"],
-                number=card_data["number"],
-                set_id=card_data["set_id"],
-                supertype=card_data.get("supertype"),
-                rarity=card_data.get("rarity"),
-                hp=card_data.get("hp"),
-                evolves_from=card_data.get("evolves_from"),
-                evolves_to=card_data.get("evolves_to", []),
-                abilities=card_data.get("abilities", []),
-                attacks=card_data.get("attacks", []),
-                weaknesses=card_data.get("weaknesses", []),
-                resistances=card_data.get("resistances", []),
-                retreat_cost=card_data.get("retreat_cost", []),
-                rules=card_data.get("rules", []),
-                images=card_data.get("images", {}),
-                tcgplayer_id=card_data.get("tcgplayer_id"),
-                cardmarket_id=card_data.get("cardmarket_id"),
-                artist=card_data.get("artist"),
-                regulation_mark=card_data.get("regulation_mark"),
-            )
+            card = PokemonCard(**_card_row(card_data))
 
             session.add(card)
             await session.commit()
             await session.refresh(card)
 
-            logger.info(f"✅ Created card: {card.name} ({card.api_id})")
+            logger.info("✅ Created card: %s (%s)", card.name, card.api_id)
             return card
 
         except IntegrityError as e:
             await session.rollback()
-            logger.error(f"Card creation failed - integrity error: {e}")
+            logger.error("Card creation failed - integrity error: %s", e)
             raise
         except Exception as e:
             await session.rollback()
-            logger.error(f"Card creation failed: {e}")
+            logger.error("Card creation failed: %s", e)
             raise
 
     @staticmethod
@@ -108,23 +253,16 @@ class CardCRUD:
     ) -> Optional[PokemonCard]:
         """Get card by internal UUID"""
         try:
-            if isinstance(card_id, str):
-                card_id = uuid.UUID(card_id)
+            card_id = _coerce_uuid(card_id)
 
             result = await session.execute(
                 select(PokemonCard)
-                .options(
-                    selectinload(PokemonCard.set),
-                    selectinload(PokemonCard.types),
-                    selectinload(PokemonCard.subtypes),
-                    selectinload(PokemonCard.variations),
-                    selectinload(PokemonCard.prices),
-                )
+                .options(*_CARD_DETAIL_OPTIONS)
                 .where(PokemonCard.id == card_id)
             )
             return result.scalar_one_or_none()
         except Exception as e:
-            logger.error(f"Error getting card by ID {card_id}: {e}")
+            logger.error("Error getting card by ID %s: %s", card_id, e)
             return None
 
     @staticmethod
@@ -133,18 +271,26 @@ class CardCRUD:
         try:
             result = await session.execute(
                 select(PokemonCard)
-                .options(
-                    selectinload(PokemonCard.set),
-                    selectinload(PokemonCard.types),
-                    selectinload(PokemonCard.subtypes),
-                    selectinload(PokemonCard.variations),
-                    selectinload(PokemonCard.prices),
-                )
+                .options(*_CARD_DETAIL_OPTIONS)
                 .where(PokemonCard.api_id == api_id)
             )
             return result.scalar_one_or_none()
         except Exception as e:
-            logger.error(f"Error getting card by API ID {api_id}: {e}")
+            logger.error("Error getting card by API ID %s: %s", api_id, e)
+            return None
+
+    @staticmethod
+    async def get_card_by_api_id_shallow(
+        session: AsyncSession, api_id: str
+    ) -> Optional[PokemonCard]:
+        """Get card by Pokemon TCG API ID without loading its relationships"""
+        try:
+            result = await session.execute(
+                select(PokemonCard).where(PokemonCard.api_id == api_id)
+            )
+            return result.scalar_one_or_none()
+        except Exception as e:
+            logger.error("Error getting card by API ID %s: %s", api_id, e)
             return None
 
     @staticmethod
@@ -163,82 +309,57 @@ class CardCRUD:
                 )
                 .where(
                     and_(
-                        PokemonCard.name.ilike(f"%{name}%"), PokemonSet.name.ilike(f"%{set_name}%")
+                        PokemonCard.name.ilike(_like_pattern(name)),
+                        PokemonSet.name.ilike(_like_pattern(set_name)),
                     )
                 )
             )
             return result.scalar_one_or_none()
         except Exception as e:
-            logger.error(f"Error getting card by name and set: {e}")
+            logger.error("Error getting card by name and set: %s", e)
             return None
 
     @staticmethod
     async def search_cards(session: AsyncSession, filters: CardSearchFilters) -> List[PokemonCard]:
         """Search cards with various filters"""
         try:
-            query = select(PokemonCard).options(
-                selectinload(PokemonCard.set),
-                selectinload(PokemonCard.types),
-                selectinload(PokemonCard.subtypes),
-            )
-
-            # Apply filters
-            conditions = []
-
-            if filters.name:
-                conditions.append(PokemonCard.name.ilike(f"%{filters.name}%"))
-
-            if filters.set_name:
-                query = query.join(PokemonSet)
-                conditions.append(PokemonSet.name.ilike(f"%{filters.set_name}%"))
-
-            if filters.set_id:
-                conditions.append(PokemonCard.set_id == filters.set_id)
-
-            if filters.supertype:
-                conditions.append(PokemonCard.supertype == filters.supertype)
-
-            if filters.rarity:
-                conditions.append(PokemonCard.rarity == filters.rarity)
-
-            if filters.hp_min:
-                conditions.append(PokemonCard.hp >= filters.hp_min)
-
-            if filters.hp_max:
-                conditions.append(PokemonCard.hp <= filters.hp_max)
-
-            if filters.artist:
-                conditions.append(PokemonCard.artist.ilike(f"%{filters.artist}%"))
-
-            if filters.number:
-                conditions.append(PokemonCard.number == filters.number)
-
-            if conditions:
-                query = query.where(and_(*conditions))
-
-            # Apply pagination
-            query = query.offset(filters.offset).limit(filters.limit)
-
-            result = await session.execute(query)
+            statement, params = _card_search(filters)
+            result = await session.execute(statement, params)
             return result.scalars().all()
 
         except Exception as e:
-            logger.error(f"Error searching cards: {e}")
+            logger.error("Error searching cards: %s", e)
             return []
 
+    @staticmethod
+    async def search_cards_stream(
+        session: AsyncSession, filters: CardSearchFilters, batch_size: int = 200
+    ) -> AsyncIterator[PokemonCard]:
+        """Search cards like search_cards, yielding them from a server-side cursor"""
+        try:
+            statement, params = _card_search(filters)
+            result = await session.stream(
+                statement.execution_options(yield_per=batch_size), params
+            )
+            async for partition in result.scalars().partitions():
+                for card in partition:
+                    yield card
+
+        except Exception as e:
+            logger.error("Error streaming card search: %s", e)
+
     @staticmethod
     async def update_card_data(
         session: AsyncSession, card_id: Union[str, uuid.UUID], updates: Dict[str, Any]
     ) -> Optional[PokemonCard]:
         """Update card data"""
         try:
-            if isinstance(card_id, str):
-                card_id = uuid.UUID(card_id)
+            card_id = _coerce_uuid(card_id)
 
-            # Get the card first
-            card = await CardCRUD.get_card_by_id(session, card_id)
+            # Get the card first; session.get() checks the identity map before querying
+            card = await session.get(PokemonCard, card_id)
             if not card:
-                logger.warning(f"Card not found for update: {card_id}")
+                logger.warning("Card not found for update: %s", card_id)
                 return None
 
             # Update fields
@@ -246,95 +367,138 @@ class CardCRUD:
                 if hasattr(card, field):
                     setattr(card, field, value)
 
-            card.updated_at = datetime.utcnow()
+            # updated_at is set by the column's onupdate
             await session.commit()
             await session.refresh(card)
 
-            logger.info(f"✅ Updated card: {card.name} ({card.api_id})")
+            logger.info("✅ Updated card: %s (%s)", card.name, card.api_id)
             return card
 
         except Exception as e:
             await session.rollback()
-            logger.error(f"Error updating card {card_id}: {e}")
+            logger.error("Error updating card %s: %s", card_id, e)
+            raise
+
+    @staticmethod
+    async def update_cards_bulk(
+        session: AsyncSession, card_ids: List[Union[str, uuid.UUID]], updates: Dict[str, Any]
+    ) -> int:
+        """Apply the same updates to many cards, returning the number of cards updated"""
+        try:
+            card_ids = [_coerce_uuid(card_id) for card_id in card_ids]
+            columns = PokemonCard.__table__.columns
+            # updated_at is set by the column's onupdate
+            values = {field: value for field, value in updates.items() if field in columns}
+            ignored = updates.keys() - values.keys()
+            if ignored:
+                logger.warning("Ignoring non-column card updates: %s", ", ".join(sorted(ignored)))
+            # Nothing to set: don't bump updated_at or report untouched rows
+            if not values or not card_ids:
+                return 0
+
+            result = await session.execute(
+                update(PokemonCard)
+                .where(PokemonCard.id.in_(card_ids))
+                .values(**values)
+                .execution_options(synchronize_session=False)
+            )
+            await session.commit()
+
+            logger.info("✅ Updated %s cards", result.rowcount)
+            return result.rowcount
+
+        except Exception as e:
+            await session.rollback()
+            logger.error("Bulk card update failed: %s", e)
             raise
 
     @staticmethod
     async def delete_card(session: AsyncSession, card_id: Union[str, uuid.UUID]) -> bool:
         """Delete a card"""
         try:
-            if isinstance(card_id, str):
-                card_id = uuid.UUID(card_id)
+            card_id = _coerce_uuid(card_id)
 
             result = await session.execute(delete(PokemonCard).where(PokemonCard.id == card_id))
             await session.commit()
 
             if result.rowcount > 0:
-                logger.info(f"✅ Deleted card: {card_id}")
+                logger.info("✅ Deleted card: %s", card_id)
                 return True
             else:
-                logger.warning(f"Card not found for deletion: {card_id}")
+                logger.warning("Card not found for deletion: %s", card_id)
                 return False
 
         except Exception as e:
             await session.rollback()
-            logger.error(f"Error deleting card {card_id}: {e}")
+            logger.error("Error deleting card %s: %s", card_id, e)
             raise
 
     @staticmethod
     async def bulk_create_cards(
         session: AsyncSession, cards_data: List[Dict[str, Any]]
     ) -> List[PokemonCard]:
-        """Create multiple cards in bulk"""
+        """Create multiple cards in bulk.
+
+        Rows missing a required field are logged and skipped. The rest are
+        inserted all-or-nothing: cards whose api_id already exists (in the
+        table or earlier in the same batch) are left as they are, but any other
+        database error, such as a set_id with no matching set, rolls back the
+        whole batch and is re-raised. Returns new and existing cards in input
+        order; only rows the database actually inserted count as created.
+        """
         try:
-            created_cards = []
-
+            # Validate every row up front so building the rows can't fail midway
+            valid = []
             for card_data in cards_data:
-                try:
-                    # Check if card already exists
-                    existing_card = await CardCRUD.get_card_by_api_id(session, card_data["api_id"])
-                    if existing_card:
-                        logger.debug(f"Card already exists: {card_data['api_id']}")
-                        created_cards.append(existing_card)
-                        continue
-
-                    # Create new card
-                    card = PokemonCard(
-                        api_id=card_data["api_id"],
-                        name=card_data["name"],
-                        number=card_data["number"],
-                        set_id=card_data["set_id"],
-                        supertype=card_data.get("supertype"),
-                        rarity=card_data.get("rarity"),
-                        hp=card_data.get("hp"),
-                        evolves_from=card_data.get("evolves_from"),
-                        evolves_to=card_data.get("evolves_to", []),
-                        abilities=card_data.get("abilities", []),
-                        attacks=card_data.get("attacks", []),
-                        weaknesses=card_data.get("weaknesses", []),
-                        resistances=card_data.get("resistances", []),
-                        retreat_cost=card_data.get("retreat_cost", []),
-                        rules=card_data.get("rules", []),
-                        images=card_data.get("images", {}),
-                        tcgplayer_id=card_data.get("tcgplayer_id"),
-                        cardmarket_id=card_data.get("cardmarket_id"),
-                        artist=card_data.get("artist"),
-                        regulation_mark=card_data.get("regulation_mark"),
+                missing = _CARD_REQUIRED_FIELDS - card_data.keys()
+                if missing:
+                    logger.error(
+                        "Error creating card %s: missing %s",
+                        card_data.get("api_id", "unknown"),
+                        ", ".join(sorted(missing)),
                     )
-
-                    session.add(card)
-                    created_cards.append(card)
-
-                except Exception as e:
-                    logger.error(f"Error creating card {card_data.get('api_id', 'unknown')}: {e}")
-                    continue
-
+                else:
+                    valid.append(card_data)
+
+            rows = [_card_row(card_data) for card_data in valid]
+            if not rows:
+                return []
+
+            # Rows go in as executemany parameters so insertmanyvalues splits
+            # them into batches under the driver's bind-parameter limit; the
+            # database skips cards that already exist and returns only the ones
+            # it inserted
+            inserted = await session.execute(
+                pg_insert(PokemonCard)
+                .on_conflict_do_nothing(index_elements=[PokemonCard.api_id])
+                .returning(PokemonCard.api_id),
+                rows,
+            )
+            created = len(inserted.all())
             await session.commit()
-            logger.info(f"✅ Bulk created {len(created_cards)} cards")
+
+            # Return new and existing cards alike, in input order
+            api_ids = list(dict.fromkeys(row["api_id"] for row in rows))
+            result = await session.execute(
+                select(PokemonCard).where(PokemonCard.api_id.in_(api_ids))
+            )
+            cards_by_api_id = {card.api_id: card for card in result.scalars()}
+            created_cards = [
+                cards_by_api_id[api_id] for api_id in api_ids if api_id in cards_by_api_id
+            ]
+
+            # One summary per batch rather than a log line per card
+            logger.info(
+                "✅ Bulk card import complete: created=%d existing=%d failed=%d",
+                created,
+                len(created_cards) - created,
+                len(cards_data) - len(rows),
+            )
             return created_cards
 
         except Exception as e:
             await session.rollback()
-            logger.error(f"Bulk card creation failed: {e}")
+            logger.error("Bulk card creation failed: %s", e)
             raise
 
 
@@ -348,40 +512,25 @@ class SetCRUD:
             # Check if set already exists
             existing_set = await SetCRUD.get_set_by_id(session, set_data["id"])
             if existing_set:
-                logger.warning(f"Set with ID {set_data['id']} already exists")
+                logger.warning("Set with ID %s already exists", set_data['id'])
                 return existing_set
 
-            # Parse release date if it's a string
-            release_date = set_data.get("release_date")
-            if isinstance(release_date, str):
-                release_date = datetime.fromisoformat(release_date.replace("Z", "+00:00")).date()
-
-            pokemon_set = PokemonSet(
-                id=set_data["id"],
-                name=set_data["name"],
-                series=set_data.get("series"),
-                printed_total=set_data.get("printed_total"),
-                total=set_data.get("total"),
-                legalities=set_data.get("legalities", {}),
-                images=set_data.get("images", {}),
-                ptcgo_code=set_data.get("ptcgo_code"),
-                release_date=release_date,
-            )
+            pokemon_set = PokemonSet(**_set_row(set_data))
 
             session.add(pokemon_set)
             await session.commit()
             await session.refresh(pokemon_set)
 
-            logger.info(f"✅ Created set: {pokemon_set.name} ({pokemon_set.id})")
+            logger.info("✅ Created set: %s (%s)", pokemon_set.name, pokemon_set.id)
             return pokemon_set
 
         except IntegrityError as e:
             await session.rollback()
-            logger.error(f"Set creation failed - integrity error: {e}")
+            logger.error("Set creation failed - integrity error: %s", e)
             raise
         except Exception as e:
             await session.rollback()
-            logger.error(f"Set creation failed: {e}")
+            logger.error("Set creation failed: %s", e)
             raise
 
     @staticmethod
@@ -395,7 +544,7 @@ class SetCRUD:
             )
             return result.scalar_one_or_none()
         except Exception as e:
-            logger.error(f"Error getting set by ID {set_id}: {e}")
+            logger.error("Error getting set by ID %s: %s", set_id, e)
             return None
 
     @staticmethod
@@ -405,11 +554,11 @@ class SetCRUD:
             result = await session.execute(
                 select(PokemonSet)
                 .options(selectinload(PokemonSet.cards))
-                .where(PokemonSet.name.ilike(f"%{name}%"))
+                .where(PokemonSet.name.ilike(_like_pattern(name)))
             )
             return result.scalar_one_or_none()
         except Exception as e:
-            logger.error(f"Error getting set by name {name}: {e}")
+            logger.error("Error getting set by name %s: %s", name, e)
             return None
 
     @staticmethod
@@ -421,34 +570,39 @@ class SetCRUD:
             )
             return result.scalars().all()
         except Exception as e:
-            logger.error(f"Error getting all sets: {e}")
+            logger.error("Error getting all sets: %s", e)
             return []
 
     @staticmethod
     async def get_set_completion_status(session: AsyncSession, set_id: str) -> Dict[str, Any]:
         """Get completion status for a set"""
         try:
-            # Get the set
-            pokemon_set = await SetCRUD.get_set_by_id(session, set_id)
-            if not pokemon_set:
-                return {}
-
-            # Count cards in database
+            # Set row and its card count in one query, without loading the cards
+            cards_in_db = (
+                select(func.count(PokemonCard.id))
+                .where(PokemonCard.set_id == PokemonSet.id)
+                .correlate(PokemonSet)
+                .scalar_subquery()
+            )
             result = await session.execute(
-                select(func.count(PokemonCard.id)).where(PokemonCard.set_id == set_id)
+                select(PokemonSet.name, PokemonSet.total, cards_in_db).where(
+                    PokemonSet.id == set_id
+                )
             )
-            cards_in_db = result.scalar() or 0
+            row = result.one_or_none()
+            if row is None:
+                return {}
 
+            set_name, total, cards_in_db = row
+            cards_in_db = cards_in_db or 0
             return {
-                "set_name": pokemon_set.name,
-                "total_cards": pokemon_set.total or 0,
+                "set_name": set_name,
+                "total_cards": total or 0,
                 "cards_in_database": cards_in_db,
-                "completion_percentage": (
-                    (cards_in_db / pokemon_set.total * 100) if pokemon_set.total else 0
-                ),
+                "completion_percentage": (cards_in_db / total * 100) if total else 0,
             }
         except Exception as e:
-            logger.error(f"Error getting set completion status: {e}")
+            logger.error("Error getting set completion status: %s", e)
             return {}
 
 
@@ -461,31 +615,20 @@ class PriceCRUD:
     ) -> PriceSnapshot:
         """Create a new price snapshot"""
         try:
-            if isinstance(card_id, str):
-                card_id = uuid.UUID(card_id)
-
-            price_snapshot = PriceSnapshot(
-                card_id=card_id,
-                variation_id=price_data.get("variation_id"),
-                timestamp=price_data.get("timestamp", datetime.utcnow()),
-                prices=price_data.get("prices", {}),
-                source=price_data.get("source", "unknown"),
-                condition=price_data.get("condition", "NM"),
-                currency=price_data.get("currency", "USD"),
-                volume=price_data.get("volume"),
-                listings_count=price_data.get("listings_count"),
-            )
+            card_id = _coerce_uuid(card_id)
+
+            price_snapshot = PriceSnapshot(**_price_row(card_id, price_data))
 
             session.add(price_snapshot)
             await session.commit()
             await session.refresh(price_snapshot)
 
-            logger.debug(f"✅ Created price snapshot for card {card_id}")
+            logger.debug("✅ Created price snapshot for card %s", card_id)
             return price_snapshot
 
         except Exception as e:
             await session.rollback()
-            logger.error(f"Price snapshot creation failed: {e}")
+            logger.error("Price snapshot creation failed: %s", e)
             raise
 
     @staticmethod
@@ -494,8 +637,7 @@ class PriceCRUD:
     ) -> Optional[PriceSnapshot]:
         """Get the latest price for a card"""
         try:
-            if isinstance(card_id, str):
-                card_id = uuid.UUID(card_id)
+            card_id = _coerce_uuid(card_id)
 
             result = await session.execute(
                 select(PriceSnapshot)
@@ -505,7 +647,33 @@ class PriceCRUD:
             )
             return result.scalar_one_or_none()
         except Exception as e:
-            logger.error(f"Error getting latest price for card {card_id}: {e}")
+            logger.error("Error getting latest price for card %s: %s", card_id, e)
+            return None
+
+    @staticmethod
+    async def get_latest_price_summary(
+        session: AsyncSession, card_id: Union[str, uuid.UUID]
+    ) -> Optional[Dict[str, Any]]:
+        """Get the latest price for a card as a plain mapping, without ORM loading"""
+        try:
+            card_id = _coerce_uuid(card_id)
+
+            # Served from the idx_price_card_latest covering index alone
+            result = await session.execute(
+                select(
+                    PriceSnapshot.prices,
+                    PriceSnapshot.timestamp,
+                    PriceSnapshot.condition,
+                    PriceSnapshot.currency,
+                )
+                .where(PriceSnapshot.card_id == card_id)
+                .order_by(PriceSnapshot.timestamp.desc())
+                .limit(1)
+            )
+            row = result.mappings().first()
+            return dict(row) if row is not None else None
+        except Exception as e:
+            logger.error("Error getting latest price for card %s: %s", card_id, e)
             return None
 
     @staticmethod
@@ -514,8 +682,7 @@ class PriceCRUD:
     ) -> List[PriceSnapshot]:
         """Get price history for a card"""
         try:
-            if isinstance(card_id, str):
-                card_id = uuid.UUID(card_id)
+            card_id = _coerce_uuid(card_id)
 
             since_date = datetime.utcnow() - timedelta(days=days)
 
@@ -528,7 +695,7 @@ class PriceCRUD:
             )
             return result.scalars().all()
         except Exception as e:
-            logger.error(f"Error getting price history for card {card_id}: {e}")
+            logger.error("Error getting price history for card %s: %s", card_id, e)
             return []
 
     @staticmethod
@@ -537,21 +704,30 @@ class PriceCRUD:
     ) -> List[PriceSnapshot]:
         """Update multiple prices in bulk"""
         try:
-            created_snapshots = []
-
+            rows = []
             for price_update in price_updates:
                 try:
-                    snapshot = await PriceCRUD.create_price_snapshot(session, **price_update)
-                    created_snapshots.append(snapshot)
-                except Exception as e:
-                    logger.error(f"Error creating price snapshot: {e}")
+                    card_id = price_update["card_id"]
+                    card_id = _coerce_uuid(card_id)
+                    rows.append(_price_row(card_id, price_update["price_data"]))
+                except (KeyError, ValueError) as e:
+                    logger.error("Error creating price snapshot: %s", e)
                     continue
 
-            logger.info(f"✅ Bulk updated {len(created_snapshots)} price snapshots")
+            if not rows:
+                return []
+
+            # One executemany INSERT for every snapshot, then a single commit
+            result = await session.scalars(insert(PriceSnapshot).returning(PriceSnapshot), rows)
+            created_snapshots = result.all()
+            await session.commit()
+
+            logger.info("✅ Bulk updated %s price snapshots", len(created_snapshots))
             return created_snapshots
 
         except Exception as e:
-            logger.error(f"Bulk price update failed: {e}")
+            await session.rollback()
+            logger.error("Bulk price update failed: %s", e)
             raise
 
 
@@ -571,7 +747,7 @@ class ValidationCRUD:
             result = await session.execute(query.order_by(ValidationRule.priority.desc()))
             return result.scalars().all()
         except Exception as e:
-            logger.error(f"Error getting validation rules: {e}")
+            logger.error("Error getting validation rules: %s", e)
             return []
 
     @staticmethod
@@ -592,12 +768,12 @@ class ValidationCRUD:
             await session.commit()
             await session.refresh(correction)
 
-            logger.info(f"✅ Created Ximilar correction")
+            logger.info("✅ Created Ximilar correction")
             return correction
 
         except Exception as e:
             await session.rollback()
-            logger.error(f"Ximilar correction creation failed: {e}")
+            logger.error("Ximilar correction creation failed: %s", e)
             raise
 
 
@@ -606,7 +782,7 @@ async def get_or_create_card(
     session: AsyncSession, card_data: Dict[str, Any]
 ) -> Tuple[PokemonCard, bool]:
     """Get existing card or create new one"""
-    card = await CardCRUD.get_card_by_api_id(session, card_data["api_id"])
+    card = await CardCRUD.get_card_by_api_id_shallow(session, card_data["api_id"])
     if card:
         return card, False
     else:
@@ -626,6 +802,54 @@ async def get_or_create_set(
         return new_set, True
 
 
+def _api_card_data(api_card_data: Dict[str, Any]) -> Dict[str, Any]:
+    """Normalized card data from a Pokemon TCG API card"""
+    set_data = api_card_data.get("set", {})
+    return {
+        "api_id": api_card_data["id"],
+        "name": api_card_data["name"],
+        "number": api_card_data["number"],
+        "set_id": set_data.get("id"),
+        "supertype": api_card_data.get("supertype"),
+        "rarity": api_card_data.get("rarity"),
+        "hp": api_card_data.get("hp"),
+        "evolves_from": api_card_data.get("evolvesFrom"),
+        "evolves_to": api_card_data.get("evolvesTo", []),
+        "abilities": api_card_data.get("abilities", []),
+        "attacks": api_card_data.get("attacks", []),
+        "weaknesses": api_card_data.get("weaknesses", []),
+        "resistances": api_card_data.get("resistances", []),
+        "retreat_cost": api_card_data.get("retreatCost", []),
+        "rules": api_card_data.get("rules", []),
+        "images": api_card_data.get("images", {}),
+        "tcgplayer_id": api_card_data.get("tcgplayer", {}).get("productId"),
+        "artist": api_card_data.get("artist"),
+        "regulation_mark": api_card_data.get("regulationMark"),
+    }
+
+
+def _best_market_price(prices: Dict[str, Any]) -> Optional[float]:
+    """Market price of the first priced category, in priority order"""
+    return next(
+        (
+            category_prices["market"]
+            for category in _PRICE_CATEGORIES
+            if (category_prices := prices.get(category)) and category_prices.get("market")
+        ),
+        None,
+    )
+
+
+def _api_price_data(best_price: float) -> Dict[str, Any]:
+    """Price snapshot data for a market price from the Pokemon TCG API"""
+    return {
+        "prices": {"market": best_price},
+        "source": "pokemon_tcg_api",
+        "condition": "NM",
+        "currency": "USD",
+    }
+
+
 async def persist_api_card_data(
     session: AsyncSession, api_card_data: Dict[str, Any]
 ) -> PokemonCard:
@@ -634,31 +858,15 @@ async def persist_api_card_data(
         # Extract set data
         set_data = api_card_data.get("set", {})
         if set_data:
-            # Create/get set first
-            await get_or_create_set(session, set_data)
+            # Create/get set first. Cards arrive many per set and sets are never
+            # deleted here, so each set is confirmed once per session.
+            known_set_ids = session.info.setdefault("persisted_set_ids", set())
+            if set_data.get("id") not in known_set_ids:
+                await get_or_create_set(session, set_data)
+                known_set_ids.add(set_data.get("id"))
 
         # Extract card data
-        card_data = {
-            "api_id": api_card_data["id"],
-            "name": api_card_data["name"],
-            "number": api_card_data["number"],
-            "set_id": set_data.get("id"),
-            "supertype": api_card_data.get("supertype"),
-            "rarity": api_card_data.get("rarity"),
-            "hp": api_card_data.get("hp"),
-            "evolves_from": api_card_data.get("evolvesFrom"),
-            "evolves_to": api_card_data.get("evolvesTo", []),
-            "abilities": api_card_data.get("abilities", []),
-            "attacks": api_card_data.get("attacks", []),
-            "weaknesses": api_card_data.get("weaknesses", []),
-            "resistances": api_card_data.get("resistances", []),
-            "retreat_cost": api_card_data.get("retreatCost", []),
-            "rules": api_card_data.get("rules", []),
-            "images": api_card_data.get("images", {}),
-            "tcgplayer_id": api_card_data.get("tcgplayer", {}).get("productId"),
-            "artist": api_card_data.get("artist"),
-            "regulation_mark": api_card_data.get("regulationMark"),
-        }
+        card_data = _api_card_data(api_card_data)
 
         # Create/get card
         card, created = await get_or_create_card(session, card_data)
@@ -666,28 +874,78 @@ async def persist_api_card_data(
         # Create price snapshot if pricing data exists
         tcgplayer_data = api_card_data.get("tcgplayer", {})
         if tcgplayer_data.get("prices"):
-            # Find the best price to store
-            prices = tcgplayer_data["prices"]
-            best_price = None
-
-            # Priority order for price categories
-            price_categories = ["normal", "holofoil", "reverseHolofoil", "1stEdition", "unlimited"]
-            for category in price_categories:
-                if category in prices and prices[category].get("market"):
-                    best_price = prices[category]["market"]
-                    break
-
+            best_price = _best_market_price(tcgplayer_data["prices"])
             if best_price:
-                price_data = {
-                    "prices": {"market": best_price},
-                    "source": "pokemon_tcg_api",
-                    "condition": "NM",
-                    "currency": "USD",
-                }
-                await PriceCRUD.create_price_snapshot(session, card.id, price_data)
+                await PriceCRUD.create_price_snapshot(
+                    session, card.id, _api_price_data(best_price)
+                )
 
         return card
 
     except Exception as e:
-        logger.error(f"Error persisting API card data: {e}")
+        logger.error("Error persisting API card data: %s", e)
+        raise
+
+
+async def persist_api_card_data_bulk(
+    session: AsyncSession, api_cards: List[Dict[str, Any]]
+) -> List[PokemonCard]:
+    """Persist many Pokemon TCG API cards with one batched INSERT per table.
+
+    The sets, cards and price snapshots are written in one transaction, all or
+    nothing. Sets and cards that already exist are kept as they are, but any
+    other error (a malformed API card, a database constraint) rolls back the
+    whole batch and is re-raised, unlike the one-card-at-a-time
+    persist_api_card_data. Returns new and existing cards in input order.
+    """
+    try:
+        # Sets first, each unique set once
+        sets_by_id = {c["set"]["id"]: c["set"] for c in api_cards if c.get("set")}
+        if sets_by_id:
+            await session.execute(
+                pg_insert(PokemonSet).on_conflict_do_nothing(index_elements=[PokemonSet.id]),
+                [_set_row(set_data) for set_data in sets_by_id.values()],
+            )
+
+        # Cards that already exist are kept as they are, like get_or_create_card
+        card_rows = [_card_row(_api_card_data(api_card)) for api_card in api_cards]
+        if not card_rows:
+            return []
+        # Executemany form, batched like bulk_create_cards
+        inserted = await session.execute(
+            pg_insert(PokemonCard)
+            .on_conflict_do_nothing(index_elements=[PokemonCard.api_id])
+            .returning(PokemonCard.api_id),
+            card_rows,
+        )
+        created = len(inserted.all())
+
+        api_ids = list(dict.fromkeys(row["api_id"] for row in card_rows))
+        result = await session.execute(select(PokemonCard).where(PokemonCard.api_id.in_(api_ids)))
+        cards_by_api_id = {card.api_id: card for card in result.scalars()}
+
+        # One price snapshot per priced card
+        price_rows = []
+        for api_card in api_cards:
+            card = cards_by_api_id.get(api_card["id"])
+            best_price = _best_market_price(api_card.get("tcgplayer", {}).get("prices") or {})
+            if card is not None and best_price:
+                price_rows.append(_price_row(card.id, _api_price_data(best_price)))
+        if price_rows:
+            await session.execute(insert(PriceSnapshot), price_rows)
+
+        await session.commit()
+        session.info.setdefault("persisted_set_ids", set()).update(sets_by_id)
+
+        logger.info(
+            "✅ Persisted API cards: created=%d existing=%d prices=%d",
+            created,
+            len(cards_by_api_id) - created,
+            len(price_rows),
+        )
+        return [cards_by_api_id[api_id] for api_id in api_ids if api_id in cards_by_api_id]
+
+    except Exception as e:
+        await session.rollback()
+        logger.error("Error persisting API card data in bulk: %s", e)
         raise
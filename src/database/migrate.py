@@ -15,7 +15,7 @@ from psycopg2.extensions import ISOLATION_LEVEL_AUTOCOMMIT
 # Add parent directory to path
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from config import Config
+from config import get_config
 
 # Set up logging
 logging.basicConfig(
@@ -28,7 +28,7 @@ class DatabaseMigrator:
     """Handles database migrations"""
 
     def __init__(self):
-        self.config = Config()
+        self.config = get_config()
         self.connection = None
 
     def connect(self):
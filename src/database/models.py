@@ -17,11 +17,17 @@ from sqlalchemy import (
     Text,
     UniqueConstraint,
     create_engine,
+    func,
 )
 from sqlalchemy.dialects.postgresql import ARRAY, JSONB, TSVECTOR, UUID
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import relationship, sessionmaker
 
+try:
+    import orjson
+except ImportError:  # Optional speedup; SQLAlchemy falls back to the stdlib json module
+    orjson = None
+
 Base = declarative_base()
 
 # Association tables for many-to-many relationships
@@ -138,6 +144,10 @@ class PokemonCard(Base):
     )
 
 
+# Backward compatibility alias
+Card = PokemonCard
+
+
 class Type(Base):
     """Pokemon types (normalized)"""
 
@@ -213,7 +223,9 @@ class PriceSnapshot(Base):
     variation_id = Column(UUID(as_uuid=True), ForeignKey("card_variations.id"))
 
     # Timestamp for time-series queries
-    timestamp = Column(DateTime, nullable=False, index=True)
+    timestamp = Column(
+        DateTime, nullable=False, index=True, server_default=func.timezone("utc", func.now())
+    )
 
     # Price data
     prices = Column(JSONB)  # {"market": 10.50, "low": 8.00, "mid": 10.00, "high": 15.00}
@@ -233,7 +245,15 @@ class PriceSnapshot(Base):
 
     __table_args__ = (
         Index("idx_price_timestamp", "timestamp"),
-        Index("idx_price_card_time", "card_id", "timestamp"),
+        # Newest-first per card, covering the latest-price lookup (migration
+        # 006); also serves card price history, so no separate (card_id,
+        # timestamp) index is kept
+        Index(
+            "idx_price_card_latest",
+            "card_id",
+            timestamp.desc(),
+            postgresql_include=["prices", "condition", "currency"],
+        ),
         Index("idx_price_variation_time", "variation_id", "timestamp"),
         # This table should be partitioned by timestamp in production
     )
@@ -299,6 +319,17 @@ class XimilarCorrection(Base):
     __table_args__ = (Index("idx_correction_ximilar", "ximilar_result", postgresql_using="gin"),)
 
 
+def _json_serializer(value):
+    """Encode a JSONB value with orjson (non-string keys allowed, as with json.dumps)"""
+    return orjson.dumps(value, option=orjson.OPT_NON_STR_KEYS).decode()
+
+
+# Engine options for the JSON/JSONB columns, empty when orjson isn't installed
+_JSON_ENGINE_KWARGS = (
+    {'json_serializer': _json_serializer, 'json_deserializer': orjson.loads} if orjson else {}
+)
+
+
 # Database configuration
 class DatabaseConfig:
     """Database configuration for production use"""
@@ -323,10 +354,39 @@ class DatabaseConfig:
             'pool_pre_ping': True,
             'pool_recycle': 3600,
             'echo': False,
+            **_JSON_ENGINE_KWARGS,
         }
         engine_kwargs.update(kwargs)
         return create_engine(connection_string, **engine_kwargs)
 
+    @staticmethod
+    def get_async_engine(connection_string, **kwargs):
+        """Create an asyncpg engine for the async CRUD layer"""
+        from sqlalchemy.ext.asyncio import create_async_engine
+
+        # Same pool settings as get_engine; create_async_engine picks the
+        # asyncio-aware queue pool itself
+        engine_kwargs = {
+            'pool_size': 20,
+            'max_overflow': 40,
+            'pool_pre_ping': True,
+            'pool_recycle': 3600,
+            'echo': False,
+            'connect_args': {
+                # The CRUD layer repeats a small set of statements; keep their
+                # prepared plans in SQLAlchemy's asyncpg dialect cache, which
+                # holds 100 by default (asyncpg's own statement cache isn't used)
+                'prepared_statement_cache_size': 2048,
+                # Short OLTP queries don't amortize JIT compilation
+                'server_settings': {'jit': 'off'},
+            },
+            **_JSON_ENGINE_KWARGS,
+        }
+        engine_kwargs.update(kwargs)
+        if connection_string.startswith("postgresql://"):
+            connection_string = "postgresql+asyncpg://" + connection_string[len("postgresql://"):]
+        return create_async_engine(connection_string, **engine_kwargs)
+
 
 def init_database(connection_string):
     """Initialize the database with all tables"""
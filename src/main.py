@@ -9,7 +9,7 @@ from typing import Dict, List
 # Flexible imports that work both as package and direct execution
 try:
     from .cache import CacheManager
-    from .config import Config
+    from .config import get_config
     from .database.optimized_service import OptimizedDatabaseService
     from .models import CardData, ImageGroup
     from .output.excel_generator import ExcelGenerator
@@ -30,7 +30,7 @@ except ImportError:
         sys.path.insert(0, str(parent_dir))
 
     from src.cache import CacheManager
-    from src.config import Config
+    from src.config import get_config
     from src.database.optimized_service import OptimizedDatabaseService
     from src.models import CardData, ImageGroup
     from src.output.excel_generator import ExcelGenerator
@@ -48,7 +48,7 @@ async def main():
         # Initialize
         logger.info("🚀 Initializing TCG eBay Batch Uploader v3.0...")
 
-        config = Config()
+        config = get_config()
 
         # Initialize optimized database service with configuration
         db_service = OptimizedDatabaseService(
@@ -1,5 +1,6 @@
 """Data models for TCG eBay uploader"""
 
+import os
 from dataclasses import dataclass, field
 from typing import Any, Dict, List, Optional
 
@@ -15,6 +16,8 @@ class ProcessingConfig:
     # Cache settings
     cache_size_gb: int = 10
     cache_ttl: int = 30  # days
+    cache_shards: int = max(4, os.cpu_count() or 1)  # SQLite shards per disk cache
+    strict_hash: bool = False  # Hash image contents instead of file metadata
 
     # Retry settings
     retry_attempts: int = 3
@@ -10,7 +10,7 @@ from typing import List
 
 from ..async_cache import AsyncCacheManager
 from ..cache import CacheManager
-from ..config import Config
+from ..config import get_config
 from ..utils.logger import logger
 from .async_group_detector import AsyncImageGroupDetector
 from .async_image_processor import AsyncImageProcessor
@@ -22,7 +22,7 @@ async def demo_async_image_processing():
     """Demonstrate async image processing capabilities"""
 
     # Initialize config
-    config = Config()
+    config = get_config()
 
     # Example image paths (you would replace with actual paths)
     image_paths = [
@@ -114,7 +114,7 @@ async def demo_async_image_processing():
 async def example_usage():
     """Example of how to use async methods in your code"""
 
-    config = Config()
+    config = get_config()
 
     # Example 1: Process multiple images concurrently
     async_processor = AsyncImageProcessor()
@@ -123,16 +123,17 @@ async def example_usage():
     # Process all images at once
     results = await async_processor.optimize_batch(image_paths)
 
-    # Example 2: Get multiple image hashes concurrently
-    cache_manager = AsyncCacheManager(Path("./cache"), config.processing)
-    hashes = await cache_manager.get_batch_image_hashes(image_paths)
+    # Example 2: Get multiple image hashes concurrently. The context manager
+    # flushes queued cache writes and stops the background threads on exit.
+    with AsyncCacheManager(Path("./cache"), config.processing) as cache_manager:
+        hashes = await cache_manager.get_batch_image_hashes(image_paths)
 
-    # Example 3: Use async group detection
-    detector = ImageGroupDetector(config)
-    groups = await detector.find_groups_async()
+        # Example 3: Use async group detection
+        detector = ImageGroupDetector(config)
+        groups = await detector.find_groups_async()
 
-    # Example 4: Warm cache for better performance
-    await cache_manager.warm_cache_for_images(image_paths)
+        # Example 4: Warm cache for better performance
+        await cache_manager.warm_cache_for_images(image_paths)
 
 
 if __name__ == "__main__":
@@ -75,7 +75,10 @@ class CardIdentifier:
             else None
         )
 
-        self.scryfall = ScryfallClient(self.config.processing.rate_limit_scryfall)
+        self.scryfall = ScryfallClient(
+            self.config.processing.rate_limit_scryfall,
+            cache_dir=self.config.cache_folder,
+        )
         self.ebay_eps = EbayEPSUploader(
             self.config.ebay_config, self.config.processing.rate_limit_ebay
         )
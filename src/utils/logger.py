@@ -33,17 +33,17 @@ class TCGLogger:
         self._logger.addHandler(console_handler)
         self._logger.addHandler(file_handler)
 
-    def info(self, message: str):
-        self._logger.info(message)
+    def info(self, message: str, *args):
+        self._logger.info(message, *args)
 
-    def error(self, message: str):
-        self._logger.error(message)
+    def error(self, message: str, *args):
+        self._logger.error(message, *args)
 
-    def warning(self, message: str):
-        self._logger.warning(message)
+    def warning(self, message: str, *args):
+        self._logger.warning(message, *args)
 
-    def debug(self, message: str):
-        self._logger.debug(message)
+    def debug(self, message: str, *args):
+        self._logger.debug(message, *args)
 
 
 # Singleton instance
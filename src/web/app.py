@@ -54,7 +54,7 @@ from web.security_utils import (
     validate_sort_parameter,
 )
 
-from config import Config
+from config import get_config
 
 # Import database models directly from the file to avoid conflicts
 import importlib.util
@@ -80,7 +80,7 @@ logger = logging.getLogger(__name__)
 app = Flask(__name__, static_folder="static")
 
 # Load configuration
-config = Config()
+config = get_config()
 
 # Generate secret key for sessions
 app.config["SECRET_KEY"] = config.secret_key
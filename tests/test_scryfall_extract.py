@@ -0,0 +1,71 @@
+"""Regression tests for the Scryfall set/oracle substring scanners"""
+
+import pytest
+
+from src.api.scryfall_extract import (
+    _ORACLE_MECHANIC_SCANNER,
+    _SET_FOIL_SCANNER,
+    _SPECIAL_FOIL_TREATMENTS,
+    _SPECIAL_MECHANICS,
+    _compile_substring_scanner,
+    _scan_in_order,
+)
+
+
+def _naive_scan(mapping, *texts):
+    """The original per-pattern loop the scanner replaces"""
+    return [label for pattern, label in mapping.items() if any(pattern in t for t in texts if t)]
+
+
+@pytest.mark.unit
+class TestScanInOrder:
+    def test_prefix_patterns_at_same_position(self):
+        mapping = {"b": "B", "abc": "ABC", "ab": "AB", "bcd": "BCD"}
+        scanner = _compile_substring_scanner(mapping)
+
+        # "ab" and "abc" start at the same position, as do "b" and "bcd"
+        assert _scan_in_order(scanner, mapping, "abcd") == ["B", "ABC", "AB", "BCD"]
+
+    def test_labels_follow_mapping_order_not_text_order(self):
+        text = "secret lair drop: from the vault"
+
+        assert _scan_in_order(_SET_FOIL_SCANNER, _SPECIAL_FOIL_TREATMENTS, text) == [
+            "Secret Lair",
+            "From the Vault",
+            "Secret Lair",
+        ]
+
+    def test_patterns_found_across_texts(self):
+        mapping = {"foil": "Foil", "etched": "Etched"}
+        scanner = _compile_substring_scanner(mapping)
+
+        assert _scan_in_order(scanner, mapping, "etched", "", "foil") == ["Foil", "Etched"]
+        assert _scan_in_order(scanner, mapping, "plain", "") == []
+
+    @pytest.mark.parametrize(
+        "text",
+        [
+            "",
+            "secret lair drop",
+            "masterpiece series: mystical archive",
+            "the brothers' war retro artifacts",
+            "from the vault: lore",
+        ],
+    )
+    def test_set_foils_match_naive_loop(self, text):
+        assert _scan_in_order(
+            _SET_FOIL_SCANNER, _SPECIAL_FOIL_TREATMENTS, text
+        ) == _naive_scan(_SPECIAL_FOIL_TREATMENTS, text)
+
+    @pytest.mark.parametrize(
+        "text",
+        [
+            "infect, toxic 2. corrupted",
+            "proliferate. put a poison counter and an experience counter",
+            "create a role token with energy",
+        ],
+    )
+    def test_oracle_mechanics_match_naive_loop(self, text):
+        assert _scan_in_order(
+            _ORACLE_MECHANIC_SCANNER, _SPECIAL_MECHANICS, text
+        ) == _naive_scan(_SPECIAL_MECHANICS, text)